@@ -0,0 +1 @@
+"""Client for the Upsilon Workshop - Benchmarks."""
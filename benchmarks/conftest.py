@@ -0,0 +1,78 @@
+"""Client for the Upsilon Workshop - Benchmark fixtures."""
+# Standard Library
+import os
+import time
+from typing import Callable, Iterator
+
+import pytest
+
+# Internal
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.api.project
+import upsilon_workshop_client.utils.clone
+
+from benchmarks import server as stand_in
+
+try:
+    import pytest_benchmark  # noqa: F401 pylint: disable=unused-import
+except ImportError:
+    # The benchmarks need the pytest-benchmark plugin
+    collect_ignore_glob = ["test_*.py"]
+
+# Projects served by the stand-in server (10 search pages)
+SERVER_PROJECTS = 1000
+
+# Synthetic local projects: number of files, size of the files
+PROJECT_SIZES = [(10, 1024), (200, 4096), (20, 256 * 1024)]
+
+
+def get_size_id(size: tuple[int, int]) -> str:
+    """Get the identifier of a project size, like 200x4KiB."""
+    return f"{size[0]}x{size[1] // 1024}KiB"
+
+
+@pytest.fixture(scope="session")
+def server() -> Iterator[stand_in.Server]:
+    """Run the stand-in server for the whole session."""
+    projects = [stand_in.make_project(index)
+                for index in range(SERVER_PROJECTS)]
+    with stand_in.Server(projects) as running_server:
+        yield running_server
+
+
+@pytest.fixture
+def client(server: stand_in.Server)\
+        -> Iterator[upsilon_workshop_client.api.client.Client]:
+    """Client of the stand-in server, without the on-disk cache."""
+    with upsilon_workshop_client.api.client.Client(server.url) as client:
+        yield client
+
+
+@pytest.fixture
+def make_local_project(tmp_path) -> Callable[
+        [int, int], tuple[str, upsilon_workshop_client.api.project.Project]]:
+    """Make a cloned project with synthetic files.
+
+    The files are spread in 10 directories, and dated in the past so their
+    checksums are cached like in a project edited a while ago.
+    """
+    def make(files: int, file_size: int)\
+            -> tuple[str, upsilon_workshop_client.api.project.Project]:
+        """Make the project, return its path and the server project."""
+        data = stand_in.make_project(0, files, file_size)
+        for index, file in enumerate(data["files"]):
+            file["name"] = f"package{index % 10}/{file['name']}"
+
+        project = upsilon_workshop_client.api.project.Project(data)
+        path = str(tmp_path / "project")
+        upsilon_workshop_client.utils.clone.save_project_to_directory(
+            project, path)
+
+        past = time.time() - 60
+        for root, _, names in os.walk(path):
+            for name in names:
+                os.utime(os.path.join(root, name), (past, past))
+
+        return path, project
+
+    return make
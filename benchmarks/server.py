@@ -0,0 +1,201 @@
+"""Client for the Upsilon Workshop - Stand-in Workshop server."""
+# Standard Library
+import argparse
+import hashlib
+import http.server
+import json
+import threading
+import urllib.parse
+
+
+def make_project(index: int, files: int = 2, file_size: int = 64)\
+        -> dict[str, str | int | list[dict[str, str]]]:
+    """Make a synthetic project, as sent by the server."""
+    return {
+        "url": f"/scripts/uuid-{index}/",
+        "name": f"project{index}",
+        "created": "2023-01-01T00:00:00Z",
+        "modified": "2023-01-02T00:00:00Z",
+        "language": "python",
+        "version": "1.0",
+        "short_description": f"Synthetic project {index}",
+        "long_description": f"Synthetic project {index}, for benchmarks.",
+        "ratings": index % 5,
+        "author": f"/users/author{index % 10}/",
+        "files": [
+            {
+                "name": f"module{file}.py",
+                "content": f"# {index}/{file}\n"
+                + "x = 1\n" * (file_size // 6),
+            }
+            for file in range(files)
+        ],
+        "licence": "MIT",
+        "compatibility": "upsilon",
+        "views": index,
+    }
+
+
+class Server:
+    """Workshop server serving synthetic projects, on a background thread.
+
+    The paginated search (following the `next` links) and the projects are
+    served with ETags like the real server. The pushes (PUT, or PATCH with
+    the changed files only) update the project, and like the real server
+    the partial updates are only advertised to the authenticated users (the
+    credentials aren't checked).
+    """
+
+    def __init__(self, projects: list[dict], page_size: int = 100,
+                 port: int = 0) -> None:
+        """Initialize the class, on a random port by default."""
+        self.projects = {project["url"]: project for project in projects}
+        self.page_size = page_size
+        self.patches = 0
+        self.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", port), self.make_handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+
+    def __enter__(self) -> "Server":
+        """Start the server."""
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get_page(self, query: dict[str, list[str]]) -> dict:
+        """Get a page of the search results."""
+        keywords = query.get("search", [""])[0].split()
+        page = int(query.get("page", ["1"])[0])
+
+        results = [project for project in self.projects.values()
+                   if all(keyword in project["name"] for keyword in keywords)]
+        start = (page - 1) * self.page_size
+
+        next_url = None
+        if start + self.page_size < len(results):
+            next_url = f"{self.url}/scripts/?" + urllib.parse.urlencode(
+                {"search": " ".join(keywords), "page": page + 1})
+
+        return {"count": len(results), "next": next_url, "previous": None,
+                "results": results[start:start + self.page_size]}
+
+    def make_handler(self) -> type:
+        """Make the request handler class of the server."""
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            """Request handler of the stand-in server."""
+
+            protocol_version = "HTTP/1.1"
+
+            # Send the small responses at once, like a production server
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:
+                """Don't log the requests."""
+
+            def do_GET(self) -> None:  # pylint: disable=invalid-name
+                """Serve the search and the projects."""
+                url = urllib.parse.urlparse(self.path)
+                if url.path == "/scripts/":
+                    body = server.get_page(urllib.parse.parse_qs(url.query))
+                elif url.path in server.projects:
+                    body = server.projects[url.path]
+                else:
+                    self.send(404, b'{"detail": "Not found."}')
+                    return
+
+                content = json.dumps(body).encode("utf-8")
+                etag = f'"{hashlib.md5(content).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send(304, b"", etag)
+                else:
+                    self.send(200, content, etag)
+
+            def do_PUT(self) -> None:  # pylint: disable=invalid-name
+                """Update a project."""
+                content = self.rfile.read(
+                    int(self.headers.get("Content-Length", 0)))
+                if self.path not in server.projects:
+                    self.send(404, b'{"detail": "Not found."}')
+                    return
+
+                payload = json.loads(content)
+                project = server.projects[self.path]
+                for field in ("name", "language", "version", "licence",
+                              "compatibility", "files"):
+                    if field in payload:
+                        project[field] = payload[field]
+
+                self.send(200, json.dumps(project).encode("utf-8"))
+
+            def do_PATCH(self) -> None:  # pylint: disable=invalid-name
+                """Update the files sent, and delete the ones listed."""
+                content = self.rfile.read(
+                    int(self.headers.get("Content-Length", 0)))
+                if self.path not in server.projects:
+                    self.send(404, b'{"detail": "Not found."}')
+                    return
+
+                payload = json.loads(content)
+                project = server.projects[self.path]
+                files = {file["name"]: file for file in project["files"]}
+                for file in payload.get("files", []):
+                    files[file["name"]] = file
+                for name in payload.get("deleted_files", []):
+                    files.pop(name, None)
+                project["files"] = list(files.values())
+                server.patches += 1
+
+                self.send(200, json.dumps(project).encode("utf-8"))
+
+            def do_OPTIONS(self) -> None:  # pylint: disable=invalid-name
+                """Describe the project endpoint."""
+                metadata: dict = {"name": "Script"}
+                if "Authorization" in self.headers:
+                    fields = {"files": {}, "deleted_files": {}}
+                    metadata["actions"] = {"PUT": fields, "PATCH": fields}
+
+                self.send(200, json.dumps(metadata).encode("utf-8"))
+
+            def send(self, status: int, content: bytes,
+                     etag: str | None = None) -> None:
+                """Send a response."""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
+
+
+def main() -> None:
+    """Run the server in the foreground, for load tests."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--projects", type=int, default=1000)
+    args = parser.parse_args()
+
+    server = Server([make_project(index) for index in range(args.projects)],
+                    port=args.port)
+
+    print(f"Serving {args.projects} projects on {server.url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Client for the Upsilon Workshop - Checksum benchmarks."""
+# Standard Library
+import os
+
+import pytest
+
+# Internal
+import upsilon_workshop_client.utils.scan
+
+from benchmarks.conftest import PROJECT_SIZES, get_size_id
+
+# Bytes hashed by the rounds of a cold benchmark: the small projects, hashed
+# in well under a millisecond, need many rounds for a stable median
+COLD_BYTES = 4 * 1024 * 1024
+
+# Minimum rounds of a cold benchmark
+COLD_MIN_ROUNDS = 10
+
+
+@pytest.mark.parametrize("size", PROJECT_SIZES, ids=get_size_id)
+def test_generate_checksums_cold(benchmark, make_local_project, size):
+    """Hash every file of a project, without the checksum cache."""
+    path, _ = make_local_project(*size)
+    cache_path = os.path.join(
+        path, upsilon_workshop_client.utils.scan.CHECKSUM_CACHE_FILE)
+
+    def remove_cache():
+        """Remove the checksum cache before each round."""
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+
+    checksums = benchmark.pedantic(
+        upsilon_workshop_client.utils.scan.generate_checksums, args=(path,),
+        setup=remove_cache,
+        rounds=max(COLD_MIN_ROUNDS, COLD_BYTES // (size[0] * size[1])))
+
+    assert len(checksums) == size[0]
+
+
+@pytest.mark.parametrize("size", PROJECT_SIZES, ids=get_size_id)
+def test_generate_checksums_warm(benchmark, make_local_project, size):
+    """Get the checksums of an unchanged project, from the cache."""
+    path, _ = make_local_project(*size)
+    upsilon_workshop_client.utils.scan.generate_checksums(path)
+
+    checksums = benchmark(
+        upsilon_workshop_client.utils.scan.generate_checksums, path)
+
+    assert len(checksums) == size[0]
@@ -0,0 +1,45 @@
+"""Client for the Upsilon Workshop - Search benchmarks."""
+import rich
+
+# Internal
+import upsilon_workshop_client.api.project
+import upsilon_workshop_client.api.search
+import upsilon_workshop_client.utils.search
+
+from benchmarks import server as stand_in
+from benchmarks.conftest import SERVER_PROJECTS
+
+
+def test_parse_projects(benchmark):
+    """Parse a large page of search results."""
+    page = [stand_in.make_project(index) for index in range(SERVER_PROJECTS)]
+
+    projects = benchmark(
+        lambda: [upsilon_workshop_client.api.project.Project(project)
+                 for project in page])
+
+    assert len(projects) == SERVER_PROJECTS
+
+
+def test_search_project(benchmark, client):
+    """List every project of the stand-in server, page by page."""
+    projects = benchmark(upsilon_workshop_client.api.search.search_project,
+                         [], client)
+
+    assert len(projects) == SERVER_PROJECTS
+
+
+def test_display_results(benchmark):
+    """Render the table of the search results."""
+    projects = [upsilon_workshop_client.api.project.Project(
+        stand_in.make_project(index)) for index in range(SERVER_PROJECTS)]
+
+    def display_results():
+        """Render the table, without printing it."""
+        with rich.get_console().capture() as capture:
+            upsilon_workshop_client.utils.search.display_results(projects)
+        return capture.get()
+
+    output = benchmark(display_results)
+
+    assert "project999" in output
@@ -0,0 +1,44 @@
+"""Client for the Upsilon Workshop - Pull and push benchmarks."""
+import pytest
+
+# Internal
+import upsilon_workshop_client.api.project
+import upsilon_workshop_client.utils.pull
+import upsilon_workshop_client.utils.push
+
+from benchmarks.conftest import PROJECT_SIZES, get_size_id
+
+
+@pytest.mark.parametrize("size", PROJECT_SIZES, ids=get_size_id)
+def test_get_changed_files(benchmark, make_local_project, size):
+    """Compare a project with the server, a tenth of the files changed."""
+    path, project = make_local_project(*size)
+    project_info = upsilon_workshop_client.utils.pull.load_project_info(path)
+
+    # Change a tenth of the files on the server
+    files = [dict(file) for file in project.files]
+    for file in files[::10]:
+        file["content"] += "# changed\n"
+    project.files = files
+
+    _, server_changed_files = benchmark(
+        upsilon_workshop_client.utils.pull.get_changed_files, project,
+        project_info, path)
+
+    assert len(server_changed_files) == len(files[::10])
+
+
+@pytest.mark.parametrize("size", PROJECT_SIZES, ids=get_size_id)
+def test_extract_files(benchmark, make_local_project, size):
+    """Read every file of a project into a push payload."""
+    path, _ = make_local_project(*size)
+
+    def extract_files():
+        """Extract the files to a new payload."""
+        payload = {}
+        upsilon_workshop_client.utils.push.extract_files(path, payload)
+        return payload
+
+    payload = benchmark(extract_files)
+
+    assert len(payload["files"]) == size[0]
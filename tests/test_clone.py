@@ -0,0 +1,41 @@
+"""Client for the Upsilon Workshop - Clone regression tests."""
+# Standard Library
+import os
+import tempfile
+import unittest
+
+# Internal
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.utils.clone
+
+from benchmarks.server import Server, make_project
+
+
+class TestCloneMany(unittest.TestCase):
+    """Clone many projects from a stand-in server."""
+
+    def setUp(self):
+        """Start the server."""
+        self.server = Server([make_project(0), make_project(1)])
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+
+        self.client = upsilon_workshop_client.api.client.Client(
+            self.server.url)
+        self.addCleanup(self.client.close)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+
+    def test_clone_many_duplicates(self):
+        """A project listed twice is cloned once, and doesn't fail."""
+        self.assertTrue(upsilon_workshop_client.utils.clone.clone_many(
+            ["/scripts/uuid-1/", "/scripts/uuid-0/", "/scripts/uuid-1/"],
+            self.path, self.client))
+        self.assertEqual(sorted(os.listdir(self.path)),
+                         ["project0", "project1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
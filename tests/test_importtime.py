@@ -0,0 +1,109 @@
+"""Client for the Upsilon Workshop - Startup import regression tests."""
+# Standard Library
+import os
+import subprocess
+import sys
+import unittest
+
+# Root of the repository, to run the package from the sources
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported by the commands using them
+HEAVY_MODULES = ("requests", "upsilon_py", "sqlite3", "rich.progress")
+
+# Budget of the import time of the package itself, in microseconds
+PACKAGE_BUDGET = 50_000
+
+
+def get_imports(*args: str) -> dict[str, int]:
+    """Run the CLI with -X importtime, return the self time of each import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "upsilon_workshop_client",
+         *args],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": ROOT},
+        check=True,
+    )
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, _, module = line[len("import time:"):].split("|")
+        imports[module.strip()] = int(self_time)
+
+    return imports
+
+
+class TestImportTime(unittest.TestCase):
+    """Check that the CLI only imports what the command needs."""
+
+    def assert_not_imported(self, imports: dict[str, int],
+                            modules: tuple[str, ...]) -> None:
+        """Check that no module of a list is imported.
+
+        The submodules of the modules are checked too, and a name ending with
+        a dot only matches the submodules.
+        """
+        for module in modules:
+            imported = [name for name in imports
+                        if name == module
+                        or name.startswith(module.rstrip(".") + ".")]
+            self.assertEqual(imported, [], f"{module} imported")
+
+    def test_help(self):
+        """The main help doesn't import any subcommand."""
+        imports = get_imports("--help")
+
+        self.assert_not_imported(imports, HEAVY_MODULES + (
+            "upsilon_workshop_client.api",
+            "upsilon_workshop_client.utils",
+            "upsilon_workshop_client.cli.workshop",
+            "upsilon_workshop_client.cli.calculator",
+            "upsilon_workshop_client.cli.simulator",
+        ))
+
+        package_time = sum(time for module, time in imports.items()
+                           if module.startswith("upsilon_workshop_client"))
+        self.assertLess(package_time, PACKAGE_BUDGET)
+
+    def test_calculator_help(self):
+        """The calculator commands don't import the HTTP client."""
+        imports = get_imports("calculator", "--help")
+
+        self.assertIn("upsilon_workshop_client.cli.calculator", imports)
+        self.assert_not_imported(imports, HEAVY_MODULES + (
+            "upsilon_workshop_client.api",
+            "upsilon_workshop_client.utils.calculator.",
+            "upsilon_workshop_client.cli.workshop",
+        ))
+
+    def test_workshop_help(self):
+        """The workshop commands don't import the calculator stack."""
+        imports = get_imports("workshop", "--help")
+
+        self.assertIn("upsilon_workshop_client.cli.workshop", imports)
+        self.assert_not_imported(imports, (
+            "requests",
+            "upsilon_py",
+            "sqlite3",
+            "upsilon_workshop_client.utils.",
+            "upsilon_workshop_client.cli.calculator",
+            "upsilon_workshop_client.cli.simulator",
+        ))
+
+    def test_workshop_command_help(self):
+        """The help of a command doesn't import the HTTP client."""
+        imports = get_imports("workshop", "clone", "--help")
+
+        self.assert_not_imported(imports, (
+            "requests",
+            "upsilon_workshop_client.api.client",
+            "upsilon_workshop_client.api.cache",
+        ))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Client for the Upsilon Workshop - Mirror regression tests."""
+# Standard Library
+import os
+import tempfile
+import unittest
+
+# Internal
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.utils.clone
+import upsilon_workshop_client.utils.mirror
+
+from benchmarks.server import Server, make_project
+
+
+class TestMirror(unittest.TestCase):
+    """Mirror the projects of a stand-in server."""
+
+    def setUp(self):
+        """Start the server."""
+        self.server = Server([make_project(0), make_project(1)])
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+
+        self.client = upsilon_workshop_client.api.client.Client(
+            self.server.url)
+        self.addCleanup(self.client.close)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+
+    def test_mirror_keeps_clones(self):
+        """The clones in the mirror directory are never removed."""
+        upsilon_workshop_client.utils.clone.clone(
+            "/scripts/uuid-1/", self.path, self.client)
+        module = os.path.join(self.path, "project1", "module0.py")
+        with open(module, "a", encoding="utf-8") as f:
+            f.write("y = 2\n")
+
+        self.assertTrue(upsilon_workshop_client.utils.mirror.mirror(
+            self.path, self.client))
+        self.assertTrue(os.path.isdir(os.path.join(self.path, "uuid-0")))
+        self.assertTrue(os.path.isdir(os.path.join(self.path, "uuid-1")))
+
+        # The projects deleted from the server are removed, not the clones
+        del self.server.projects["/scripts/uuid-1/"]
+        self.assertTrue(upsilon_workshop_client.utils.mirror.mirror(
+            self.path, self.client))
+        self.assertFalse(os.path.exists(os.path.join(self.path, "uuid-1")))
+
+        with open(module, "r", encoding="utf-8") as f:
+            self.assertTrue(f.read().endswith("y = 2\n"))
+
+    def test_mirror_refuses_to_overwrite(self):
+        """A directory named after a project, not mirrored, is kept."""
+        os.mkdir(os.path.join(self.path, "uuid-0"))
+        with open(os.path.join(self.path, "uuid-0", "notes.txt"), "w",
+                  encoding="utf-8") as f:
+            f.write("notes\n")
+
+        self.assertFalse(upsilon_workshop_client.utils.mirror.mirror(
+            self.path, self.client))
+        self.assertEqual(os.listdir(os.path.join(self.path, "uuid-0")),
+                         ["notes.txt"])
+        self.assertTrue(os.path.isdir(os.path.join(self.path, "uuid-1")))
+
+
+if __name__ == "__main__":
+    unittest.main()
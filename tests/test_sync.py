@@ -0,0 +1,93 @@
+"""Client for the Upsilon Workshop - Clone, pull and push regression tests."""
+# Standard Library
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+# Internal
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.utils.clone
+import upsilon_workshop_client.utils.pull
+import upsilon_workshop_client.utils.push
+
+from benchmarks.server import Server, make_project
+
+
+class TestSync(unittest.TestCase):
+    """Sync a project with a stand-in server."""
+
+    def setUp(self):
+        """Start the server, and clone a project."""
+        self.server = Server([make_project(0, files=3)])
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+
+        self.client = upsilon_workshop_client.api.client.Client(
+            self.server.url)
+        self.addCleanup(self.client.close)
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        upsilon_workshop_client.utils.clone.clone(
+            "/scripts/uuid-0/", directory.name, self.client)
+        self.path = os.path.join(directory.name, "project0")
+
+        # Pushes authenticate with the token of the environment
+        patcher = unittest.mock.patch.dict(
+            os.environ, {"UPSILON_WORKSHOP_TOKEN": "token"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_server_files(self) -> dict[str, str]:
+        """Get the files of the project on the server."""
+        return {file["name"]: file["content"] for file in
+                self.server.projects["/scripts/uuid-0/"]["files"]}
+
+    def edit_on_server(self, name: str, content: str) -> None:
+        """Change a file on the server, and the modification date."""
+        project = self.server.projects["/scripts/uuid-0/"]
+        project["files"] = [dict(file, content=content)
+                            if file["name"] == name else file
+                            for file in project["files"]]
+        project["modified"] = "2023-01-03T00:00:00Z"
+
+    def test_pull_keeps_local_changes(self):
+        """The local changes of the files not pulled are still pushed."""
+        with open(os.path.join(self.path, "module1.py"), "a",
+                  encoding="utf-8") as f:
+            f.write("y = 2\n")
+        os.remove(os.path.join(self.path, "module2.py"))
+        self.edit_on_server("module0.py", "z = 3\n")
+
+        upsilon_workshop_client.utils.pull.pull(self.path, self.client)
+
+        with open(os.path.join(self.path, "module0.py"), "r",
+                  encoding="utf-8") as f:
+            self.assertEqual(f.read(), "z = 3\n")
+
+        changes = upsilon_workshop_client.utils.push.get_local_changes(
+            self.path)
+        self.assertEqual(changes["modified"], ["module1.py"])
+        self.assertEqual(changes["deleted"], ["module2.py"])
+        self.assertEqual(changes["added"], [])
+
+        upsilon_workshop_client.utils.push.push(self.path, self.client)
+
+        # Only the changes are sent, as the server supports it
+        self.assertEqual(self.server.patches, 1)
+
+        files = self.get_server_files()
+        self.assertEqual(files["module0.py"], "z = 3\n")
+        self.assertTrue(files["module1.py"].endswith("y = 2\n"))
+        self.assertNotIn("module2.py", files)
+
+        # Everything is in sync after the push
+        changes = upsilon_workshop_client.utils.push.get_local_changes(
+            self.path)
+        self.assertFalse(any(changes.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,11 @@
 """Client for the Upsilon Workshop - Client init."""
-from upsilon_workshop_client import api
-from upsilon_workshop_client import cli
-from upsilon_workshop_client import utils
+# Internal
+from upsilon_workshop_client import lazy
+
+# The submodules are imported when first used, to start the CLI faster
+__getattr__, __dir__ = lazy.attach(__name__, [
+    "api",
+    "cli",
+    "timings",
+    "utils",
+])
@@ -1,3 +1,12 @@
 """Client for the Upsilon Workshop - API Entrypoint."""
-from upsilon_workshop_client.api import project
-from upsilon_workshop_client.api import search
+# Internal
+from upsilon_workshop_client import lazy
+
+# The submodules are imported when first used, to start the CLI faster
+__getattr__, __dir__ = lazy.attach(__name__, [
+    "auth",
+    "cache",
+    "client",
+    "project",
+    "search",
+])
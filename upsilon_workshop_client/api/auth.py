@@ -0,0 +1,127 @@
+"""Client for the Upsilon Workshop - Authentication API."""
+# Standard Library
+import json
+import logging
+import os
+from typing import Optional
+
+import requests
+import requests.auth
+
+# Internal
+from upsilon_workshop_client import timings
+from . import client as api_client
+
+logger = logging.getLogger(__name__)
+
+# Environment variable holding a token, used before the stored ones (for CI)
+TOKEN_ENVIRONMENT_VARIABLE = "UPSILON_WORKSHOP_TOKEN"
+
+# Endpoint exchanging credentials for a token
+TOKEN_ENDPOINT = "/api-token-auth/"
+
+
+class TokenAuth(requests.auth.AuthBase):
+    """Token authentication (Authorization: Token <token>)."""
+
+    def __init__(self, token: str) -> None:
+        """Initialize the class."""
+        self.token: str = token
+
+    def __call__(self, request: requests.PreparedRequest)\
+            -> requests.PreparedRequest:
+        """Add the token to a request."""
+        request.headers["Authorization"] = f"Token {self.token}"
+        return request
+
+
+def get_config_directory() -> str:
+    """Get the per-user configuration directory of the client."""
+    if os.name == "nt":
+        base = os.environ.get("APPDATA",
+                              os.path.expanduser("~/AppData/Roaming"))
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME",
+                              os.path.expanduser("~/.config"))
+
+    return os.path.join(base, "upsilon-workshop-client")
+
+
+def get_credentials_path() -> str:
+    """Get the path of the file storing the tokens."""
+    return os.path.join(get_config_directory(), "credentials.json")
+
+
+def load_tokens() -> dict[str, str]:
+    """Load the stored tokens, keyed by server URL."""
+    try:
+        with open(get_credentials_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_tokens(tokens: dict[str, str]) -> None:
+    """Save the tokens, readable only by the user."""
+    path = get_credentials_path()
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+
+    file_descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                              0o600)
+    with os.fdopen(file_descriptor, "w", encoding="utf-8") as f:
+        json.dump(tokens, f, indent=4)
+
+    # Fix the permissions of a file created by an older version
+    os.chmod(path, 0o600)
+
+
+def get_token(client: api_client.Client) -> Optional[str]:
+    """Get the token of the server, from the environment or the storage."""
+    if token := os.environ.get(TOKEN_ENVIRONMENT_VARIABLE):
+        logger.debug("Using the token from %s.", TOKEN_ENVIRONMENT_VARIABLE)
+        return token
+
+    return load_tokens().get(client.url)
+
+
+def login(username: str, password: str, client: api_client.Client) -> str:
+    """Exchange the credentials for a token, and store it."""
+    logger.debug("Logging in to %s as %s...", client.url, username)
+
+    response = client.post(
+        TOKEN_ENDPOINT,
+        data={"username": username, "password": password},
+        timeout=10,
+    )
+
+    # Check the response
+    if response.status_code != 200:
+        logger.error(
+            "Failed to log in: %s (status code %s)",
+            response.text,
+            response.status_code,
+        )
+        raise ValueError(
+            f"Failed to log in: {response.text} "
+            f"(status code {response.status_code})"
+        )
+
+    with timings.phase("json"):
+        token: str = response.json()["token"]
+
+    # Store the token
+    tokens = load_tokens()
+    tokens[client.url] = token
+    save_tokens(tokens)
+
+    return token
+
+
+def logout(client: api_client.Client) -> bool:
+    """Remove the stored token of the server, return True if removed."""
+    tokens = load_tokens()
+    if tokens.pop(client.url, None) is None:
+        return False
+
+    save_tokens(tokens)
+    return True
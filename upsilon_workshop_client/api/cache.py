@@ -0,0 +1,188 @@
+"""Client for the Upsilon Workshop - HTTP response cache."""
+# Standard Library
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional
+
+# Internal
+from upsilon_workshop_client import timings
+
+logger = logging.getLogger(__name__)
+
+# Default maximum size of the cache, in bytes
+DEFAULT_MAX_SIZE = 50 * 1024 * 1024
+
+# Share of the maximum size kept when evicting, so the next stores don't
+# have to scan the cache again
+EVICTION_RATIO = 0.9
+
+
+def get_cache_directory() -> str:
+    """Get the per-user cache directory of the client."""
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA",
+                              os.path.expanduser("~/AppData/Local"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+
+    return os.path.join(base, "upsilon-workshop-client")
+
+
+class ResponseCache:
+    """On-disk cache of HTTP responses, revalidated with conditional requests.
+
+    Each entry is a file named after the hash of the URL: the first line holds
+    the JSON metadata (URL, ETag, Last-Modified) and the rest is the body. The
+    least recently used entries are evicted when the cache exceeds its size.
+    """
+
+    def __init__(self, directory: Optional[str] = None,
+                 max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """Initialize the class."""
+        if directory is None:
+            directory = os.path.join(get_cache_directory(), "http")
+
+        self.directory: str = directory
+        self.max_size: int = max_size
+        self.lock = threading.Lock()
+
+        # Size of the entries, read from the directory on the first store and
+        # then kept up to date, so the directory is only scanned to evict
+        self.size: Optional[int] = None
+
+    def get_entry_path(self, url: str) -> str:
+        """Get the path of the entry of an URL."""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key)
+
+    def load(self, url: str) -> Optional[tuple[dict[str, str], bytes]]:
+        """Load the metadata and the body of an URL, if cached."""
+        entry_path = self.get_entry_path(url)
+        try:
+            with timings.phase("disk"), open(entry_path, "rb") as f:
+                metadata = json.loads(f.readline())
+                body = f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+
+        # Ignore hash collisions
+        if metadata.get("url") != url:
+            return None
+
+        return metadata, body
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as recently used."""
+        try:
+            os.utime(self.get_entry_path(url))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def get_validators(metadata: dict[str, str]) -> dict[str, str]:
+        """Get the conditional request headers of an entry."""
+        headers = {}
+        if metadata.get("etag"):
+            headers["If-None-Match"] = metadata["etag"]
+        if metadata.get("last_modified"):
+            headers["If-Modified-Since"] = metadata["last_modified"]
+
+        return headers
+
+    def store(self, url: str, etag: Optional[str],
+              last_modified: Optional[str], body: bytes) -> None:
+        """Store a response."""
+        # Responses without validators can't be revalidated
+        if etag is None and last_modified is None:
+            return
+
+        # Don't let a single response flush the whole cache
+        if len(body) > self.max_size:
+            return
+
+        metadata = json.dumps({"url": url, "etag": etag,
+                               "last_modified": last_modified})
+        entry_path = self.get_entry_path(url)
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Write to a temporary file first so readers never see partial entries
+        with timings.phase("disk"):
+            try:
+                replaced_size = os.path.getsize(entry_path)
+            except FileNotFoundError:
+                replaced_size = 0
+
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=self.directory, suffix=".tmp")
+            with os.fdopen(file_descriptor, "wb") as f:
+                f.write(metadata.encode("utf-8") + b"\n")
+                f.write(body)
+            os.replace(temporary_path, entry_path)
+
+        with self.lock:
+            if self.size is None:
+                self.size = sum(size for _, size, _ in self.scan_entries())
+            else:
+                self.size += len(metadata.encode("utf-8")) + 1 + len(body)\
+                    - replaced_size
+            full = self.size > self.max_size
+
+        if full:
+            self.evict()
+
+    def scan_entries(self) -> list[tuple[int, int, str]]:
+        """List the access time, size and path of the entries."""
+        entries = []
+        with os.scandir(self.directory) as iterator:
+            for entry in iterator:
+                if entry.name.endswith(".tmp") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        return entries
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits.
+
+        The directory is scanned for the actual size, as other processes may
+        share the cache.
+        """
+        with self.lock:
+            entries = self.scan_entries()
+            total_size = sum(size for _, size, _ in entries)
+            self.size = total_size
+
+            if total_size <= self.max_size:
+                return
+
+            # Oldest first
+            entries.sort()
+            for _, size, path in entries:
+                if total_size <= self.max_size * EVICTION_RATIO:
+                    break
+                logger.debug("Evicting %s from the cache.", path)
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+
+            self.size = total_size
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self.lock:
+            self.size = 0
+            try:
+                with os.scandir(self.directory) as iterator:
+                    for entry in iterator:
+                        if entry.is_file():
+                            os.remove(entry.path)
+            except FileNotFoundError:
+                pass
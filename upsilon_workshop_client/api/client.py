@@ -0,0 +1,137 @@
+"""Client for the Upsilon Workshop - HTTP client."""
+# Standard Library
+import logging
+from typing import Optional
+
+import requests
+import requests.adapters
+import requests.auth
+
+# Internal
+from upsilon_workshop_client import timings
+from . import cache as api_cache
+
+logger = logging.getLogger(__name__)
+
+
+class Client:
+    """HTTP client bound to a Workshop server.
+
+    All the requests go through a single keep-alive session, so the TCP and
+    TLS handshakes are only paid once per host.
+    """
+
+    def __init__(self, url: str, pool_size: int = 10,
+                 timeout: float = 10,
+                 cache: Optional[api_cache.ResponseCache] = None) -> None:
+        """Initialize the class."""
+        logger.debug("Initializing client for %s...", url)
+
+        # Remove the trailing slash from the url if present
+        self.url: str = url.strip("/")
+        self.timeout: float = timeout
+        self.cache: Optional[api_cache.ResponseCache] = cache
+
+        # Authentication of the requests modifying the server, set by the
+        # first of them
+        self.auth: Optional[requests.auth.AuthBase | tuple[str, str]] = None
+
+        # Create the session, with a connection pool sized for concurrent use
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def build_url(self, path: str) -> str:
+        """Build an absolute URL from a path relative to the server."""
+        # Absolute URLs (other servers, or already resolved) are kept as is
+        if path.startswith(("http://", "https://")):
+            return path
+
+        return f"{self.url}/{path.lstrip('/')}"
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request through the session."""
+        url = self.build_url(path)
+        kwargs.setdefault("timeout", self.timeout)
+
+        logger.debug("%s %s", method, url)
+
+        with timings.phase("network"):
+            return self.session.request(method, url, **kwargs)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        """Send a GET request."""
+        return self.request("GET", path, **kwargs)
+
+    def get_cached(self, path: str, **kwargs) -> requests.Response:
+        """Send a GET request, revalidating the cached response if any.
+
+        When the server answers 304 Not Modified, the cached body is returned
+        as a 200 response, so the callers don't have to handle the cache.
+        """
+        if self.cache is None:
+            return self.get(path, **kwargs)
+
+        # Key the cache on the full URL, including the query parameters
+        url = self.session.prepare_request(requests.Request(
+            "GET", self.build_url(path), params=kwargs.pop("params", None)
+        )).url
+
+        # Add the conditional request headers
+        entry = self.cache.load(url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            headers.update(self.cache.get_validators(entry[0]))
+
+        response = self.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            logger.debug("Using cached response for %s", url)
+            self.cache.touch(url)
+            response.status_code = 200
+            response._content = entry[1]  # pylint: disable=W0212
+            response.encoding = "utf-8"
+            return response
+
+        if response.status_code == 200:
+            self.cache.store(
+                url,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                response.content,
+            )
+
+        return response
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        """Send a POST request."""
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> requests.Response:
+        """Send a PUT request."""
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path: str, **kwargs) -> requests.Response:
+        """Send a PATCH request."""
+        return self.request("PATCH", path, **kwargs)
+
+    def options(self, path: str, **kwargs) -> requests.Response:
+        """Send an OPTIONS request."""
+        return self.request("OPTIONS", path, **kwargs)
+
+    def close(self) -> None:
+        """Close the session and its pooled connections."""
+        logger.debug("Closing client for %s...", self.url)
+        self.session.close()
+
+    def __enter__(self) -> "Client":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Exit the context manager."""
+        self.close()
@@ -1,84 +1,127 @@
 """Client for the Upsilon Workshop - Project API."""
 # Standard Library
 import logging
-import requests
 import datetime
+from typing import Optional
+
+import requests.auth
+
+# Internal
+from upsilon_workshop_client import timings
+from . import client as api_client
 
 logger = logging.getLogger(__name__)
 
+# Field listing the files to delete in a partial update
+PARTIAL_UPDATE_FIELD = "deleted_files"
+
 
 class Project:
-    """Project object."""
+    """Project object.
+
+    The fields are extracted from the server dict, which is not kept. The
+    dates and the author are only decoded when accessed, as search listings
+    rarely need them.
+    """
+
+    __slots__ = (
+        "url", "name", "language", "version", "short_description",
+        "long_description", "ratings", "files", "licence", "compatibility",
+        "views", "_created", "_modified", "_author",
+    )
 
     def __init__(self, project: dict[
             str, str | int | list[str] | list[dict[str, str]]
     ]) -> None:
         """Initialize the class."""
-        logger.debug("Initializing project object...")
-        self.project = project
-
-        self.parse()
+        self.parse(project)
 
-    def parse(self):
+    def parse(self, project: dict[
+            str, str | int | list[str] | list[dict[str, str]]
+    ]) -> None:
         """Parse the project."""
-        logger.debug("Parsing project...")
-
         # Add url to the project
-        # self.url: str = self.project["url"]
         # Remove the server url from the project url (keep only the /scripts/UUID/)
-        self.url: str = "/scripts/" + self.project["url"].split("/scripts/")[-1]
-
+        self.url: str = "/scripts/" + project["url"].split("/scripts/")[-1]
 
         # Add name to the project
-        self.name: str = self.project["name"]
+        self.name: str = project["name"]
 
-        # Add creation and modification dates to the project
-        self.created = datetime.datetime.fromisoformat(
-            self.project["created"].replace("Z", "+00:00")
-        )
-        self.modified = datetime.datetime.fromisoformat(
-            self.project["modified"].replace("Z", "+00:00")
-        )
+        # Keep the raw creation and modification dates, they are parsed on
+        # first access
+        self._created: str | datetime.datetime = project["created"]
+        self._modified: str | datetime.datetime = project["modified"]
 
         # Add language to the project
-        self.language: str = self.project["language"]
+        self.language: str = project["language"]
 
         # Add version to the project
-        self.version: str = self.project["version"]
+        self.version: str = project["version"]
 
         # Add short description to the project
-        self.short_description: str = self.project["short_description"]
+        self.short_description: str = project["short_description"]
 
         # Add long description to the project
-        self.long_description: str = self.project["long_description"]
+        self.long_description: str = project["long_description"]
 
         # Add ratings to the project
-        self.ratings: float = self.project["ratings"]
+        self.ratings: float = project["ratings"]
 
-        # Add author to the project
-        self.author: str = self.project["author"].split("/")[-2]
+        # Keep the raw author URL, the name is extracted on first access
+        self._author: str | None = project["author"]
 
         # TODO: Collaborators
 
-        # Add files to the project
-        self.files: list[dict[str, str]] = self.project["files"]
+        # Add files to the project (the list is shared, not copied)
+        self.files: list[dict[str, str]] = project.get("files", [])
 
         # Add license to the project
-        self.licence: str = self.project["licence"]
+        self.licence: str = project["licence"]
 
         # Add compatibility to the project
-        self.compatibility: str = self.project["compatibility"]
+        self.compatibility: str = project["compatibility"]
 
         # Add views to the project
-        self.views: int = self.project["views"]
+        self.views: int = project["views"]
 
+    @property
+    def created(self) -> datetime.datetime:
+        """Creation date of the project."""
+        if isinstance(self._created, str):
+            self._created = parse_date(self._created)
+        return self._created
 
-def get_project(project_name: str) -> Project:
+    @property
+    def modified(self) -> datetime.datetime:
+        """Modification date of the project."""
+        if isinstance(self._modified, str):
+            self._modified = parse_date(self._modified)
+        return self._modified
+
+    @property
+    def author(self) -> str:
+        """Name of the author of the project."""
+        # The author is given as an URL (.../users/NAME/)
+        if self._author is not None and "/" in self._author:
+            self._author = self._author.split("/")[-2]
+        return self._author
+
+    def __repr__(self) -> str:
+        """Represent the project."""
+        return f"<Project {self.name!r} ({self.url})>"
+
+
+def parse_date(date: str) -> datetime.datetime:
+    """Parse a date sent by the server."""
+    return datetime.datetime.fromisoformat(date.replace("Z", "+00:00"))
+
+
+def get_project(project_name: str, client: api_client.Client) -> Project:
     """Get a project."""
     logger.debug("Getting project %s...", project_name)
 
     # Request the server
-    response = requests.get(
+    response = client.get_cached(
         project_name,
         timeout=5,
     )
@@ -93,11 +136,41 @@ def get_project(project_name: str) -> Project:
         )
         raise ValueError(
             f"Failed to get project {project_name}: {response.text} "
-            "(status code {response.status_code})"
+            f"(status code {response.status_code})"
         )
 
     # Parse the response into a dict (JSON)
-    project_dict = response.json()
+    with timings.phase("json"):
+        project_dict = response.json()
 
     # Turn the project into a Project object
     return Project(project_dict)
+
+
+def supports_partial_update(project_name: str, client: api_client.Client,
+                            auth: Optional[requests.auth.AuthBase |
+                                           tuple[str, str]] = None) -> bool:
+    """Check if the server accepts partial updates of the project files.
+
+    A server supporting them lists the `deleted_files` field in the metadata
+    of the project endpoint, and updates only the files sent in a PATCH. The
+    actions are only listed for the users allowed to run them, so the
+    request must be authenticated like the update.
+    """
+    logger.debug("Checking partial update support for %s...", project_name)
+
+    try:
+        response = client.options(project_name, auth=auth, timeout=5)
+        metadata = response.json()
+    except ValueError:
+        return False
+
+    if response.status_code != 200 or not isinstance(metadata, dict):
+        return False
+
+    actions = metadata.get("actions") or {}
+    for method in ("PATCH", "PUT"):
+        if PARTIAL_UPDATE_FIELD in (actions.get(method) or {}):
+            return True
+
+    return False
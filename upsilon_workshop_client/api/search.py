@@ -1,44 +1,68 @@
 """Client for the Upsilon Workshop - Project Search API."""
 # Standard Library
 import logging
-import requests
+from typing import Iterator, Optional
 
 # Internal
+from upsilon_workshop_client import timings
+from . import client as api_client
 from . import project
 
 logger = logging.getLogger(__name__)
 
 
-def search_project(keywords: list[str], url: str) -> list[project.Project]:
+def search_project(keywords: list[str], client: api_client.Client,
+                   max_results: Optional[int] = None)\
+        -> list[project.Project]:
     """Search a project."""
+    return list(iter_search_project(keywords, client, max_results))
+
+
+def iter_search_project(keywords: list[str], client: api_client.Client,
+                        max_results: Optional[int] = None)\
+        -> Iterator[project.Project]:
+    """Search a project, yielding the results as the pages arrive.
+
+    The pages are requested lazily by following the `next` link, so stopping
+    the iteration (or reaching `max_results`) stops the requests.
+    """
     logger.debug("Searching %s...", keywords)
 
-    # Construct the URL
-    search_url = f"{url}/scripts/?search="
-
-    # Add the keywords to the URL
-    for keyword in keywords:
-        search_url += f"{keyword}+"
-
-    # Remove the last +
-    search_url = search_url[:-1]
-
-    # Get the response
-    response = requests.get(search_url, timeout=10)
-
-    # Check the response
-    if response.status_code != 200:
-        logger.error(
-            "Failed to search %s: %s (status code %s)",
-            keywords,
-            response.text,
-            response.status_code,
-        )
-        raise ValueError(
-            f"Failed to search {keywords}: {response.text} "
-            f"(status code {response.status_code})",
-        )
-
-    return [
-        project.Project(result) for result in response.json()["results"]
-    ]
+    # Construct the URL, the keywords are joined with + by the encoding
+    search_url: Optional[str] = "/scripts/"
+    params: Optional[dict[str, str]] = {"search": " ".join(keywords)}
+
+    count = 0
+    while search_url is not None:
+        if max_results is not None and count >= max_results:
+            return
+
+        # Get the response
+        response = client.get_cached(search_url, params=params, timeout=10)
+
+        # Check the response
+        if response.status_code != 200:
+            logger.error(
+                "Failed to search %s: %s (status code %s)",
+                keywords,
+                response.text,
+                response.status_code,
+            )
+            raise ValueError(
+                f"Failed to search {keywords}: {response.text} "
+                f"(status code {response.status_code})",
+            )
+
+        with timings.phase("json"):
+            page = response.json()
+
+        for result in page["results"]:
+            if max_results is not None and count >= max_results:
+                return
+
+            count += 1
+            yield project.Project(result)
+
+        # The next link already contains the query parameters
+        search_url = page.get("next")
+        params = None
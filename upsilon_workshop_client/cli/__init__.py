@@ -1,4 +1,11 @@
 """Client for the Upsilon Workshop - CLI Argument parser."""
-from upsilon_workshop_client.cli import parse
-from upsilon_workshop_client.cli import calculator
-from upsilon_workshop_client.cli import workshop
+# Internal
+from upsilon_workshop_client import lazy
+
+# The submodules are imported when first used, to start the CLI faster
+__getattr__, __dir__ = lazy.attach(__name__, [
+    "calculator",
+    "parse",
+    "simulator",
+    "workshop",
+])
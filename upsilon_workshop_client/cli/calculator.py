@@ -2,6 +2,7 @@
 # Standard Library
 import logging
 import asyncio
+from typing import Optional
 
 # Third-party
 import typer
@@ -13,27 +14,158 @@ import upsilon_workshop_client.utils.calculator as calculator_utils
 # Initialize logger
 logger = logging.getLogger(__name__)
 
-app = typer.Typer()
+app = typer.Typer(add_completion=False)
+
+
+# Default backup repository, distinct from the `backup` directory of scripts
+# written by the previous versions
+DEFAULT_REPOSITORY = "calculator-backups"
 
 
 @app.command()
 def backup(
-    destination: str = typer.Argument("backup"),
+    destination: str = typer.Argument(DEFAULT_REPOSITORY),
+    name: str = typer.Option(
+        "calculator",
+        "--name",
+        "-n",
+        help="Name of the calculator, to keep the snapshots of several ones.",
+    ),
 ):
-    """Backup a project."""
+    """Backup the calculator as a new snapshot of a backup repository."""
     logger.debug("Backing up calculator to %s", destination)
 
-    asyncio.run(calculator_utils.backup.backup(destination))
+    try:
+        asyncio.run(calculator_utils.backup.backup(destination, name))
+    except ValueError as error:
+        logger.error("%s", error)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def restore(
+    source: str = typer.Argument(DEFAULT_REPOSITORY),
+    snapshot: Optional[str] = typer.Argument(
+        None,
+        help="Snapshot to restore (the latest one by default).",
+    ),
+    name: Optional[str] = typer.Option(
+        None,
+        "--name",
+        "-n",
+        help="Restore the latest snapshot of this calculator.",
+    ),
+    output: Optional[str] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Save the scripts to a directory instead of the calculator.",
+    ),
+):
+    """Restore a snapshot of a backup repository."""
+    logger.debug("Restoring %s from %s", snapshot, source)
+
+    try:
+        asyncio.run(calculator_utils.backup.restore(source, snapshot, name,
+                                                    output))
+    except ValueError as error:
+        logger.error("%s", error)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def snapshots(
+    source: str = typer.Argument(DEFAULT_REPOSITORY),
+    name: Optional[str] = typer.Option(
+        None,
+        "--name",
+        "-n",
+        help="Only list the snapshots of this calculator.",
+    ),
+):
+    """List the snapshots of a backup repository."""
+    try:
+        calculator_utils.backup.display_snapshots(source, name)
+    except ValueError as error:
+        logger.error("%s", error)
+        raise typer.Exit(code=1)
 
 
 @app.command()
 def upload(
     source: str = typer.Argument("backup"),
+    minify: bool = typer.Option(
+        False,
+        "--minify",
+        "-m",
+        help="Remove the comments, docstrings and extra spaces of the "
+        "scripts.",
+    ),
+    rename_locals: bool = typer.Option(
+        False,
+        "--rename-locals",
+        help="Also rename the local variables to short names (with "
+        "--minify).",
+    ),
 ):
     """Upload a project."""
     logger.debug("Uploading calculator from %s", source)
 
-    asyncio.run(calculator_utils.upload.upload(source))
+    try:
+        asyncio.run(calculator_utils.upload.upload(source, minify,
+                                                   rename_locals))
+    except ValueError as error:
+        logger.error("%s", error)
+        raise typer.Exit(code=1)
+
+
+@app.command(name="list")
+def list_records(
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Read the calculator again instead of the daemon cache.",
+    ),
+):
+    """List the records of the calculator."""
+    try:
+        asyncio.run(calculator_utils.backup.display_records(refresh))
+    except ValueError as error:
+        logger.error("%s", error)
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def daemon(
+    stop: bool = typer.Option(
+        False,
+        "--stop",
+        help="Stop the running daemon.",
+    ),
+):
+    """Keep the calculator connected, to speed up the other commands."""
+    if stop:
+        asyncio.run(stop_daemon())
+        return
+
+    try:
+        asyncio.run(calculator_utils.daemon.serve())
+    except ValueError as error:
+        logger.error("%s", error)
+        raise typer.Exit(code=1)
+    except KeyboardInterrupt:
+        logger.info("Daemon stopped.")
+
+
+async def stop_daemon() -> None:
+    """Ask the running daemon to stop."""
+    client = await calculator_utils.daemon.connect()
+    if client is None:
+        logger.error("The daemon isn't running.")
+        raise typer.Exit(code=1)
+
+    await client.request("stop")
+    await client.stop()
 
 
 if __name__ == "__main__":
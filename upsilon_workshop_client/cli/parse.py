@@ -1,8 +1,13 @@
 """Client for the Upsilon Workshop - Main Argument parser."""
 # Standard Library
 import logging
+import sys
+import time
+from typing import Optional
 
 import typer
+import typer.core
+import typer.main
 
 # Import Rich logger if available
 try:
@@ -12,27 +17,94 @@ try:
 except ImportError:
     HAS_RICH_LOGGER = False
 
-from . import workshop, calculator, simulator
+# Internal
+from upsilon_workshop_client import lazy
+from upsilon_workshop_client import timings
 
 logger = logging.getLogger(__name__)
 
+# Subcommands, with their module and help, imported only when they're run
+SUBCOMMANDS = {
+    "workshop": (
+        "upsilon_workshop_client.cli.workshop",
+        "Workshop interaction commands",
+    ),
+    "calculator": (
+        "upsilon_workshop_client.cli.calculator",
+        "Calculator management commands",
+    ),
+    "simulator": (
+        "upsilon_workshop_client.cli.simulator",
+        "Simulator management commands",
+    ),
+}
+
+
+
+class Options(dict):
+    """Options shared by the commands, the HTTP client created on first use.
+
+    The HTTP stack is only imported by the commands using the server, not by
+    the others or the help.
+    """
+
+    def __init__(self, url: str, verbose: bool, no_cache: bool) -> None:
+        """Initialize the class."""
+        super().__init__(url=url, verbose=verbose)
+        self.no_cache = no_cache
+
+    def __missing__(self, key: str):
+        """Create the HTTP client shared by every command."""
+        if key != "client":
+            raise KeyError(key)
+
+        # pylint: disable=import-outside-toplevel
+        from upsilon_workshop_client.api.cache import ResponseCache
+        from upsilon_workshop_client.api.client import Client
+
+        client = Client(self["url"],
+                        cache=None if self.no_cache else ResponseCache())
+        self["client"] = client
+        return client
+
+    def close(self) -> None:
+        """Close the pooled connections of the client, if it was created."""
+        if "client" in self:
+            self["client"].close()
+
+
+class LazyGroup(typer.core.TyperGroup):
+    """Command group importing the subcommands only when they're run."""
+
+    def list_commands(self, ctx: typer.Context) -> list[str]:
+        """List the subcommands, loaded or not."""
+        return [*super().list_commands(ctx),
+                *(name for name in SUBCOMMANDS if name not in self.commands)]
+
+    def get_command(self, ctx: typer.Context, cmd_name: str):
+        """Get a subcommand, described without importing it for the help."""
+        if cmd_name in SUBCOMMANDS and cmd_name not in self.commands:
+            return typer.core.TyperGroup(name=cmd_name,
+                                         help=SUBCOMMANDS[cmd_name][1])
+
+        return super().get_command(ctx, cmd_name)
+
+    def resolve_command(self, ctx: typer.Context, args: list[str]):
+        """Import the subcommand that is run."""
+        if args and args[0] in SUBCOMMANDS and args[0] not in self.commands:
+            module_name, help_text = SUBCOMMANDS[args[0]]
+            logger.debug("Loading %s...", module_name)
+
+            command = typer.main.get_command(
+                lazy.import_module(module_name).app)
+            command.help = help_text
+            self.add_command(command, args[0])
+
+        return super().resolve_command(ctx, args)
 
-app = typer.Typer(context_settings={"help_option_names": ["-h", "--help"]})
-app.add_typer(
-    workshop.app,
-    name="workshop",
-    help="Workshop interaction commands"
-)
-app.add_typer(
-    calculator.app,
-    name="calculator",
-    help="Calculator management commands"
-)
-app.add_typer(
-    simulator.app,
-    name="simulator",
-    help="Simulator management commands"
-)
+
+app = typer.Typer(cls=LazyGroup,
+                  context_settings={"help_option_names": ["-h", "--help"]})
 
 
 @app.callback()
@@ -48,6 +120,23 @@ def main(
         "https://yann.n1n1.xyz/",
         help="The URL of the Upsilon Workshop server.",
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Don't cache the server responses on disk.",
+    ),
+    show_timings: bool = typer.Option(
+        False,
+        "--timings",
+        help="Print the time spent in the network, JSON decoding, hashing, "
+        "disk writes and prompts.",
+    ),
+    profile: Optional[str] = typer.Option(
+        None,
+        "--profile",
+        help="Write a profile of the command: a Chrome trace of the phases "
+        "if the file ends with .json, cProfile stats otherwise.",
+    ),
 ) -> None:
     """Upsilon CLI."""
     if verbose:
@@ -67,10 +156,74 @@ def main(
             else [logging.StreamHandler()],
         )
 
+    # Measure the phases of the command, and profile it if asked
+    if show_timings or profile is not None:
+        start_timings(ctx, show_timings, profile)
+
     # Remove the first and last slash from the url if present
     url = url.strip("/")
 
-    ctx.obj = {"url": url, "verbose": verbose}
+    # The HTTP client is created by the first command using it, and its
+    # pooled connections are closed when the command ends
+    ctx.obj = Options(url, verbose, no_cache)
+    ctx.call_on_close(ctx.obj.close)
+
+
+def start_timings(ctx: typer.Context, show_timings: bool,
+                  profile: Optional[str]) -> None:
+    """Record the phases of the command, and report them when it ends."""
+    tracing = profile is not None and profile.endswith(".json")
+    timings.RECORDER.enable(tracing)
+
+    profiler = None
+    if profile is not None and not tracing:
+        # pylint: disable=import-outside-toplevel
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def report() -> None:
+        """Write the profile, and print the timings."""
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile)
+            logger.info("Profile written to %s.", profile)
+        elif tracing:
+            timings.RECORDER.write_trace(profile, " ".join(sys.argv[1:]))
+            logger.info("Trace written to %s.", profile)
+
+        if show_timings:
+            display_timings()
+
+    ctx.call_on_close(report)
+
+
+def display_timings() -> None:
+    """Print the time spent in each phase, on the standard error."""
+    # pylint: disable=import-outside-toplevel
+    import rich.box
+    import rich.console
+    import rich.table
+
+    duration = time.perf_counter() - timings.RECORDER.start
+
+    table = rich.table.Table("Phase", "Calls", "Time", "Share",
+                             title="Timings", box=rich.box.HORIZONTALS)
+    measured = 0.0
+    for name, (count, total) in timings.RECORDER.get_summary().items():
+        measured += total
+        table.add_row(name, str(count), f"{total * 1000:.1f} ms",
+                      f"{total / duration:.0%}")
+
+    # The phases of concurrent commands can overlap
+    if measured < duration:
+        table.add_row("other", "", f"{(duration - measured) * 1000:.1f} ms",
+                      f"{(duration - measured) / duration:.0%}")
+    table.add_row("total", "", f"{duration * 1000:.1f} ms", "",
+                  style="bold")
+
+    rich.console.Console(stderr=True).print(table)
 
 
 def parse_args() -> None:
@@ -1,6 +1,7 @@
 """Client for the Upsilon Workshop - Calculator Argument parser."""
 # Standard Library
 import logging
+import os
 from typing import Optional
 
 # Third-party
@@ -13,14 +14,15 @@ import upsilon_workshop_client.utils.simulator as simulator_utils
 # Initialize logger
 logger = logging.getLogger(__name__)
 
-app = typer.Typer()
+app = typer.Typer(add_completion=False)
 
 
 @app.command()
 def run(
+    ctx: typer.Context,
     project: Optional[str] = typer.Argument(
         None,
-        help="Project to import into the simulator.",
+        help="Script or project directory to import into the simulator.",
     ),
     firmware: str = typer.Option(
         "upsilon",
@@ -28,11 +30,79 @@ def run(
         "-f",
         help="Simulator firmware to use.",
     ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Check for a newer simulator even if the cached one is recent.",
+    ),
 ):
     """Run a simulator."""
     logger.info("Starting simulator")
 
-    simulator_utils.run.run(project, firmware)
+    simulator_utils.run.run(project, firmware, ctx.obj["client"], refresh)
+
+
+@app.command()
+def prefetch(
+    ctx: typer.Context,
+    firmwares: Optional[list[str]] = typer.Argument(
+        None,
+        help="Simulator firmwares to download (all by default).",
+    ),
+):
+    """Download the latest simulators, to run them offline."""
+    logger.debug("Prefetching simulators %s", firmwares)
+
+    simulator_utils.download.prefetch(
+        firmwares or sorted(simulator_utils.download.SIMULATORS),
+        ctx.obj["client"]
+    )
+
+
+@app.command()
+def test(
+    ctx: typer.Context,
+    projects: list[str] = typer.Argument(
+        ...,
+        help="Scripts or project directories to run.",
+    ),
+    firmwares: Optional[list[str]] = typer.Option(
+        None,
+        "--firmware",
+        "-f",
+        help="Simulator firmware to use, repeat it to test several ones.",
+    ),
+    jobs: int = typer.Option(
+        os.cpu_count() or 4,
+        "--jobs",
+        "-j",
+        help="Maximum number of simulators run concurrently.",
+    ),
+    timeout: float = typer.Option(
+        30,
+        "--timeout",
+        "-t",
+        help="Seconds after which a simulator is killed.",
+    ),
+    report: Optional[str] = typer.Option(
+        None,
+        "--report",
+        "-r",
+        help="Write a JUnit (.xml) or JSON (.json) report.",
+    ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Check for a newer simulator even if the cached one is recent.",
+    ),
+):
+    """Run scripts or projects in headless simulators."""
+    logger.debug("Testing %s", projects)
+
+    if not simulator_utils.test.test(projects, firmwares or ["upsilon"],
+                                     ctx.obj["client"], jobs, timeout,
+                                     report, refresh):
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 """Client for the Upsilon Workshop - Workshop Argument parser."""
 # Standard library
 import logging
+from typing import Optional
 
 # Third-party
 import typer
@@ -13,80 +14,303 @@ import upsilon_workshop_client.utils as utils
 logger = logging.getLogger(__name__)
 
 # Initialize typer app
-app = typer.Typer()
+app = typer.Typer(add_completion=False)
 
 
 @app.command()
 def clone(
     ctx: typer.Context,
-    project: str,
-    destination: str = typer.Argument("."),
+    projects: Optional[list[str]] = typer.Argument(
+        None,
+        help="UUIDs or URLs of the projects to clone, optionally followed "
+        "by the destination directory.",
+    ),
+    destination: str = typer.Option(
+        ".",
+        "--destination",
+        "-d",
+        help="Directory to clone the projects into.",
+    ),
+    from_file: Optional[str] = typer.Option(
+        None,
+        "--from-file",
+        "-f",
+        help="File listing the projects to clone, one per line.",
+    ),
+    jobs: int = typer.Option(
+        8,
+        "--jobs",
+        "-j",
+        help="Maximum number of projects cloned concurrently.",
+    ),
+    overwrite: bool = typer.Option(
+        False,
+        "--overwrite",
+        help="Overwrite existing directories when cloning many projects.",
+    ),
 ):
-    """Clone a project."""
-    project = project.strip("/")
+    """Clone one or many projects."""
+    projects = list(projects or [])
 
-    if not project.startswith("/scripts/") and\
-            not project.startswith("scripts/"):
-        project = f"/scripts/{project}"
+    # The last argument is the destination if it isn't a project, as in
+    # `clone PROJECT DESTINATION`
+    if len(projects) > 1 and destination == "." and\
+            not utils.clone.is_project_reference(projects[-1]):
+        destination = projects.pop()
 
-    print(ctx.obj["url"], project, destination)
-    # If the project is /scripts/UUID, we need to add the url
-    if project.startswith("scripts/"):
-        project = "/" + project
+    # Don't query the server with paths
+    for project in projects:
+        if utils.clone.is_path(project):
+            logger.error("%s is not a project UUID or URL (give the "
+                         "destination last, or with --destination).",
+                         project)
+            raise typer.Exit(code=1)
 
-    if project.startswith("/scripts/"):
-        # Add the url
-        project = ctx.obj["url"] + project
+    if from_file is not None:
+        projects += utils.clone.read_project_list(from_file)
 
-    # Add a trailing slash to the project if not present
-    if not project.endswith("/"):
-        project += "/"
+    if not projects:
+        logger.error("No project to clone.")
+        raise typer.Exit(code=1)
 
-    logger.debug("Cloning project %s to %s", project, destination)
+    project_urls = [utils.clone.get_project_url(project)
+                    for project in projects]
 
-    utils.clone.clone(project, destination)
+    logger.debug("Cloning projects %s to %s", project_urls, destination)
+
+    # A single project is cloned interactively
+    if len(project_urls) == 1 and from_file is None:
+        utils.clone.clone(project_urls[0], destination, ctx.obj["client"])
+        return
+
+    if not utils.clone.clone_many(project_urls, destination,
+                                  ctx.obj["client"], jobs, overwrite):
+        raise typer.Exit(code=1)
 
 
 @app.command()
 def push(
-    project: str = typer.Argument(".")
+    ctx: typer.Context,
+    project: str = typer.Argument("."),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        "-n",
+        help="Only show the files that would be pushed.",
+    ),
 ):
     """Push a project."""
     logger.debug("Pushing project %s", project)
 
-    utils.push.push(project)
+    utils.push.push(project, ctx.obj["client"], dry_run)
 
 
 @app.command()
 def pull(
-    project: str,
+    ctx: typer.Context,
+    project: str = typer.Argument("."),
+    all_projects: bool = typer.Option(
+        False,
+        "--all",
+        "-a",
+        help="Pull every project found under the path.",
+    ),
+    jobs: int = typer.Option(
+        8,
+        "--jobs",
+        "-j",
+        help="Maximum number of projects pulled concurrently (with --all).",
+    ),
 ):
     """Pull a project."""
     logger.debug("Pulling project %s", project)
 
-    utils.pull.pull(project)
+    if all_projects:
+        if not utils.workspace.sync(project, ctx.obj["client"], True, jobs):
+            raise typer.Exit(code=1)
+        return
+
+    utils.pull.pull(project, ctx.obj["client"])
+
+
+@app.command()
+def status(
+    ctx: typer.Context,
+    path: str = typer.Argument("."),
+    jobs: int = typer.Option(
+        8,
+        "--jobs",
+        "-j",
+        help="Maximum number of projects checked concurrently.",
+    ),
+):
+    """Show the status of every project found under a path."""
+    logger.debug("Checking projects in %s", path)
+
+    if not utils.workspace.sync(path, ctx.obj["client"], False, jobs):
+        raise typer.Exit(code=1)
 
 
 @app.command()
 def init(
     ctx: typer.Context,
     path: str = typer.Argument("."),
+    assume_yes: bool = typer.Option(
+        False,
+        "--yes",
+        "-y",
+        help="Don't ask for confirmation.",
+    ),
 ):
     """Init a project."""
     logger.debug("Initializing project %s", path)
 
-    utils.init.init(path, ctx.obj["url"])
+    utils.init.init(path, ctx.obj["client"], assume_yes)
+
+
+@app.command()
+def login(
+    ctx: typer.Context,
+    username: Optional[str] = typer.Option(
+        None,
+        "--username",
+        "-u",
+        help="Username, asked if not given.",
+    ),
+):
+    """Log in and store a token for the next commands."""
+    logger.debug("Logging in")
+
+    utils.login.login(ctx.obj["client"], username)
+
+
+@app.command()
+def logout(
+    ctx: typer.Context,
+):
+    """Remove the stored token."""
+    logger.debug("Logging out")
+
+    utils.login.logout(ctx.obj["client"])
 
 
 @app.command()
 def search(
     ctx: typer.Context,
     keywords: list[str],
+    max_results: Optional[int] = typer.Option(
+        50,
+        "--max-results",
+        "-n",
+        help="Maximum number of results to fetch (0 for no limit).",
+    ),
+    offline: bool = typer.Option(
+        False,
+        "--offline",
+        help="Search in the local catalog instead of the server.",
+    ),
 ):
     """Search a project."""
     logger.debug("Searching project %s", keywords)
 
-    utils.search.search(keywords, ctx.obj["url"])
+    utils.search.search(keywords, ctx.obj["client"], max_results or None,
+                        offline)
+
+
+@app.command()
+def mirror(
+    ctx: typer.Context,
+    destination: str = typer.Argument(
+        ...,
+        help="Directory holding the mirrored projects.",
+    ),
+    jobs: int = typer.Option(
+        8,
+        "--jobs",
+        "-j",
+        help="Maximum number of projects downloaded concurrently.",
+    ),
+):
+    """Mirror every project of the server, downloading only the changes."""
+    logger.debug("Mirroring projects to %s", destination)
+
+    if not utils.mirror.mirror(destination, ctx.obj["client"], jobs):
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def update_catalog(
+    ctx: typer.Context,
+):
+    """Index every project of the server for offline searches."""
+    logger.debug("Updating catalog")
+
+    utils.catalog.update(ctx.obj["client"])
+
+
+@app.command()
+def loadtest(
+    ctx: typer.Context,
+    mix: str = typer.Option(
+        "search=4,get=6",
+        "--mix",
+        "-m",
+        help="Weights of the requests sent (search, get and push).",
+    ),
+    duration: float = typer.Option(
+        30,
+        "--duration",
+        "-d",
+        help="Duration of the test, in seconds.",
+    ),
+    max_requests: Optional[int] = typer.Option(
+        None,
+        "--requests",
+        "-n",
+        help="Stop after this number of requests.",
+    ),
+    concurrency: int = typer.Option(
+        8,
+        "--concurrency",
+        "-c",
+        help="Number of requests sent concurrently.",
+    ),
+    rate: Optional[float] = typer.Option(
+        None,
+        "--rate",
+        "-r",
+        help="Total requests sent per second (as fast as possible if not "
+        "given).",
+    ),
+    keywords: Optional[list[str]] = typer.Option(
+        None,
+        "--keyword",
+        "-k",
+        help="Keywords of the searches, picked at random (repeatable).",
+    ),
+    push_project: Optional[str] = typer.Option(
+        None,
+        "--push-project",
+        help="Project pushed back unchanged by the push requests.",
+    ),
+    report: Optional[str] = typer.Option(
+        None,
+        "--report",
+        help="Write the results to a JSON file.",
+    ),
+):
+    """Load test the server with a mix of requests."""
+    logger.debug("Load testing with mix %s", mix)
+
+    try:
+        success = utils.loadtest.loadtest(
+            ctx.obj["client"], mix, duration, max_requests, concurrency,
+            rate, keywords, push_project, report)
+    except ValueError as error:
+        raise typer.Exit(code=1) from error
+
+    if not success:
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+"""Client for the Upsilon Workshop - Lazy submodule imports."""
+# Standard Library
+import sys
+import types
+from typing import Callable
+
+
+def import_module(name: str) -> types.ModuleType:
+    """Import a module by name.
+
+    Unlike importlib.import_module, __import__ goes through the import
+    statement machinery, so the import is reported by `python -X importtime`.
+    """
+    __import__(name)
+    return sys.modules[name]
+
+
+def attach(package: str, submodules: list[str])\
+        -> tuple[Callable[[str], types.ModuleType], Callable[[], list[str]]]:
+    """Import the submodules of a package when they're first used.
+
+    Return the `__getattr__` and `__dir__` functions of the package (PEP 562),
+    so `package.submodule` keeps working without importing every submodule
+    (and their dependencies) with the package.
+    """
+    def __getattr__(name: str) -> types.ModuleType:
+        """Import a submodule."""
+        if name in submodules:
+            return import_module(f"{package}.{name}")
+
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__() -> list[str]:
+        """List the submodules."""
+        return sorted(submodules)
+
+    return __getattr__, __dir__
@@ -0,0 +1,90 @@
+"""Client for the Upsilon Workshop - Phase timings."""
+# Standard Library
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import ContextManager, Iterator
+
+# Phases measured by the api and utils layers
+PHASES = ("network", "json", "hashing", "disk", "prompt")
+
+
+class Recorder:
+    """Time spent in each phase of a command, disabled by default.
+
+    The time is summed over the threads, so the phases of the commands
+    working concurrently (clone of many projects, mirror...) can add up to
+    more than the duration of the command.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the class."""
+        self.enabled = False
+        self.tracing = False
+        self.start = time.perf_counter()
+        self.totals: dict[str, float] = collections.defaultdict(float)
+        self.counts: dict[str, int] = collections.defaultdict(int)
+        self.events: list[dict[str, str | int | float]] = []
+        self.lock = threading.Lock()
+
+    def enable(self, tracing: bool = False) -> None:
+        """Start recording, and keep every phase for a trace if asked."""
+        self.enabled = True
+        self.tracing = tracing
+        self.start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Measure the time spent in a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self.lock:
+                self.totals[name] += end - start
+                self.counts[name] += 1
+                if self.tracing:
+                    self.events.append({
+                        "name": name,
+                        "ph": "X",
+                        "ts": (start - self.start) * 1_000_000,
+                        "dur": (end - start) * 1_000_000,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                    })
+
+    def get_summary(self) -> dict[str, tuple[int, float]]:
+        """Get the number of calls and the time of each phase."""
+        return {name: (self.counts[name], self.totals[name])
+                for name in PHASES if name in self.counts}
+
+    def write_trace(self, path: str, command: str) -> None:
+        """Write the phases as a Chrome trace (chrome://tracing, Perfetto)."""
+        end = time.perf_counter()
+        events = [{
+            "name": command,
+            "ph": "X",
+            "ts": 0,
+            "dur": (end - self.start) * 1_000_000,
+            "pid": os.getpid(),
+            "tid": threading.main_thread().ident,
+        }, *self.events]
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+# Recorder of the running command
+RECORDER = Recorder()
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Measure the time spent in a phase, if the timings are enabled."""
+    if not RECORDER.enabled:
+        return contextlib.nullcontext()
+
+    return RECORDER.measure(name)
@@ -1,7 +1,19 @@
 """Client for the Upsilon Workshop - Various utilities."""
-from upsilon_workshop_client.utils import calculator
-from upsilon_workshop_client.utils import clone
-from upsilon_workshop_client.utils import init
-from upsilon_workshop_client.utils import pull
-from upsilon_workshop_client.utils import push
-from upsilon_workshop_client.utils import search
+# Internal
+from upsilon_workshop_client import lazy
+
+# The submodules are imported when first used, to start the CLI faster
+__getattr__, __dir__ = lazy.attach(__name__, [
+    "calculator",
+    "catalog",
+    "clone",
+    "init",
+    "loadtest",
+    "login",
+    "mirror",
+    "pull",
+    "push",
+    "scan",
+    "search",
+    "workspace",
+])
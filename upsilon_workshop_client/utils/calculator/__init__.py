@@ -1,3 +1,12 @@
 """Client for the Upsilon Workshop - Various utilities to manage calculator."""
-from upsilon_workshop_client.utils.calculator import backup
-from upsilon_workshop_client.utils.calculator import upload
+# Internal
+from upsilon_workshop_client import lazy
+
+# The submodules are imported when first used, to start the CLI faster
+__getattr__, __dir__ = lazy.attach(__name__, [
+    "backup",
+    "daemon",
+    "minify",
+    "repository",
+    "upload",
+])
@@ -1,30 +1,102 @@
 """Client for the Upsilon Workshop - Calculator backup handler."""
 import logging
 import os
+from typing import Optional
 
-import upsilon_py
+import rich
+import rich.box
+import rich.table
+
+import upsilon_workshop_client.utils.calculator.daemon
+import upsilon_workshop_client.utils.calculator.repository
 
 logger = logging.getLogger(__name__)
 
 
-async def backup(path: str) -> None:
-    """Backup the calculator."""
+async def backup(path: str, name: str = "calculator") -> None:
+    """Backup the calculator as a new snapshot of a repository."""
     logger.info("Backing up calculator to %s...", path)
 
-    # Get the calculator
-    calculator = upsilon_py.NumWorks()
-    await calculator.start()
-
-    print("Please plug your calculator to your computer.")
-    await calculator.connect()
+    # Get the calculator, through the daemon if it's running
+    calculator = await upsilon_workshop_client.utils.calculator.daemon.\
+        get_calculator()
 
     # Backup the calculator
     storage = await calculator.backup_storage()
 
-    # Save the calculator to the directory
-    save_calculator_to_directory(path, storage)
+    # Save the records that changed since the previous snapshots
+    snapshot_id, written = upsilon_workshop_client.utils.calculator.\
+        repository.save_snapshot(path, storage, name)
+
+    print(f"Snapshot {snapshot_id} saved ({written} of "
+          f"{len(storage['records'])} records written).")
+
+
+async def restore(path: str, snapshot_id: Optional[str] = None,
+                  name: Optional[str] = None,
+                  output: Optional[str] = None) -> None:
+    """Restore a snapshot (the latest one by default) to the calculator.
+
+    If an output directory is given, the scripts are saved to it instead.
+    """
+    storage = upsilon_workshop_client.utils.calculator.repository.\
+        load_snapshot(path, snapshot_id, name)
+
+    if output is not None:
+        save_calculator_to_directory(output, storage)
+        return
+
+    logger.info("Restoring %s to the calculator...",
+                snapshot_id or "the latest snapshot")
+
+    # Get the calculator, through the daemon if it's running
+    calculator = await upsilon_workshop_client.utils.calculator.daemon.\
+        get_calculator()
+
+    # Install the snapshot
+    await calculator.install_storage(storage)
+
+    logger.info("Calculator restored.")
+
+
+async def display_records(refresh: bool = False) -> None:
+    """Display the records of the calculator."""
+    # Get the calculator, through the daemon if it's running
+    calculator = await upsilon_workshop_client.utils.calculator.daemon.\
+        get_calculator()
+
+    if isinstance(calculator,
+                  upsilon_workshop_client.utils.calculator.daemon.
+                  DaemonClient):
+        records = await calculator.list_records(refresh)
+    else:
+        records = upsilon_workshop_client.utils.calculator.daemon.\
+            list_records(await calculator.backup_storage())
+
+    table = rich.table.Table("Name", "Type", "Size", title="Calculator",
+                             box=rich.box.HORIZONTALS)
+    for record in records:
+        table.add_row(record["name"], record["type"],
+                      "" if record["size"] is None else str(record["size"]))
+
+    rich.print(table)
+
+
+def display_snapshots(path: str, name: Optional[str] = None) -> None:
+    """Display the snapshots of a repository."""
+    table = rich.table.Table("Snapshot", "Calculator", "Created", "Records",
+                             title="Snapshots", box=rich.box.HORIZONTALS)
+
+    snapshots = upsilon_workshop_client.utils.calculator.repository.\
+        list_snapshots(path, name)
+    for snapshot in snapshots:
+        table.add_row(snapshot["id"], snapshot["name"], snapshot["created"],
+                      str(snapshot["records"]))
 
-    logger.info("Calculator backed up to %s.", path)
+    if not snapshots:
+        rich.print("No snapshot found.")
+    else:
+        rich.print(table)
 
 
 def save_calculator_to_directory(path: str, storage: dict) -> None:
@@ -0,0 +1,250 @@
+"""Client for the Upsilon Workshop - Calculator connection daemon."""
+import asyncio
+import json
+import logging
+import os
+from typing import Optional
+
+import upsilon_py
+
+import upsilon_workshop_client.api.cache
+
+logger = logging.getLogger(__name__)
+
+# Maximum size of a message (a whole storage, as a JSON line)
+MESSAGE_LIMIT = 16 * 1024 * 1024
+
+
+def get_socket_path() -> str:
+    """Get the path of the socket of the daemon, private to the user."""
+    directory = os.environ.get("XDG_RUNTIME_DIR") or\
+        upsilon_workshop_client.api.cache.get_cache_directory()
+
+    return os.path.join(directory, "upsilon-workshop-calculator.sock")
+
+
+def list_records(storage: dict) -> list[dict[str, str | int]]:
+    """List the name, type and size of the records of a storage."""
+    return [
+        {
+            "name": record["name"],
+            "type": record["type"],
+            "size": len(record["code"].encode("utf-8"))
+            if "code" in record else None,
+        }
+        for record in storage["records"]
+    ]
+
+
+class Daemon:
+    """Hold the connection to the calculator, and serve the requests.
+
+    The storage is read once and then kept up to date with the installs, so
+    the edits made on the calculator itself while the daemon runs are only
+    seen after a request with `refresh`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the class."""
+        self.calculator: Optional[upsilon_py.NumWorks] = None
+        self.storage: Optional[dict] = None
+        self.lock = asyncio.Lock()
+        self.stopped = asyncio.Event()
+
+    async def get_calculator(self) -> upsilon_py.NumWorks:
+        """Get the calculator, connecting to it if needed."""
+        if self.calculator is None:
+            calculator = upsilon_py.NumWorks()
+            await calculator.start()
+
+            print("Please plug your calculator to your computer.")
+            await calculator.connect()
+            logger.info("Calculator connected.")
+
+            self.calculator = calculator
+
+        return self.calculator
+
+    async def reset(self) -> None:
+        """Drop the connection and the cache, to reconnect next time."""
+        calculator, self.calculator, self.storage = self.calculator, None, None
+        if calculator is not None:
+            try:
+                await calculator.stop()
+            except Exception as error:  # pylint: disable=broad-except
+                logger.debug("Failed to stop the calculator: %s", error)
+
+    async def backup_storage(self, refresh: bool = False) -> dict:
+        """Get the storage, from the cache unless a refresh is asked."""
+        if self.storage is None or refresh:
+            calculator = await self.get_calculator()
+            self.storage = await calculator.backup_storage()
+
+        return self.storage
+
+    async def install_storage(self, storage: dict) -> dict[str, str]:
+        """Install the storage, and cache it."""
+        calculator = await self.get_calculator()
+        result = await calculator.install_storage(storage)
+        self.storage = storage
+
+        return result
+
+    async def run_request(self, request: dict) -> dict:
+        """Run a request, one at a time, and return the response."""
+        method = request.get("method")
+        logger.debug("Running %s", method)
+
+        async with self.lock:
+            try:
+                if method == "backup":
+                    result = await self.backup_storage(
+                        request.get("refresh", False))
+                elif method == "install":
+                    result = await self.install_storage(request["storage"])
+                elif method == "list":
+                    result = list_records(await self.backup_storage(
+                        request.get("refresh", False)))
+                elif method == "stop":
+                    self.stopped.set()
+                    result = None
+                else:
+                    return {"error": f"Unknown method {method}"}
+            except Exception as error:  # pylint: disable=broad-except
+                # The calculator may have been unplugged, reconnect next time
+                logger.error("%s failed: %s", method, error)
+                await self.reset()
+                return {"error": f"{error.__class__.__name__}: {error}"}
+
+        return {"result": result}
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of a client, one JSON object by line."""
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.run_request(json.loads(line))
+                except ValueError as error:
+                    response = {"error": f"Invalid request: {error}"}
+
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            # The daemon is stopping, or the client left
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(path: Optional[str] = None) -> None:
+    """Run the daemon until a stop request."""
+    path = path or get_socket_path()
+
+    if await connect(path) is not None:
+        logger.error("The daemon is already running on %s", path)
+        raise ValueError(f"The daemon is already running on {path}")
+
+    # Remove the socket of a daemon that didn't stop properly
+    if os.path.exists(path):
+        os.remove(path)
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+
+    daemon = Daemon()
+    await daemon.get_calculator()
+
+    server = await asyncio.start_unix_server(daemon.handle, path,
+                                             limit=MESSAGE_LIMIT)
+    os.chmod(path, 0o600)
+    logger.info("Daemon listening on %s", path)
+
+    try:
+        async with server:
+            await daemon.stopped.wait()
+    finally:
+        os.remove(path)
+        await daemon.reset()
+
+    logger.info("Daemon stopped.")
+
+
+class DaemonClient:
+    """Calculator served by the daemon, with the API of upsilon_py.NumWorks."""
+
+    def __init__(self, reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter) -> None:
+        """Initialize the class."""
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, method: str, **kwargs) -> dict | list | None:
+        """Send a request to the daemon, and return its result."""
+        self.writer.write(
+            json.dumps({"method": method, **kwargs}).encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+        line = await self.reader.readline()
+        if not line:
+            raise ValueError("The daemon closed the connection")
+
+        response = json.loads(line)
+        if "error" in response:
+            raise ValueError(f"Daemon error: {response['error']}")
+
+        return response["result"]
+
+    async def backup_storage(self, refresh: bool = True) -> dict:
+        """Get the storage of the calculator.
+
+        Like with upsilon_py, the storage is read from the calculator by
+        default, as it may have been edited (or swapped) since the daemon
+        cached it.
+        """
+        return await self.request("backup", refresh=refresh)
+
+    async def install_storage(self, storage: dict) -> dict[str, str]:
+        """Install the storage on the calculator."""
+        return await self.request("install", storage=storage)
+
+    async def list_records(self, refresh: bool = False)\
+            -> list[dict[str, str | int]]:
+        """List the records of the calculator."""
+        return await self.request("list", refresh=refresh)
+
+    async def stop(self) -> None:
+        """Close the connection to the daemon (the daemon keeps running)."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def connect(path: Optional[str] = None) -> Optional[DaemonClient]:
+    """Connect to the daemon, return None if it isn't running."""
+    # Unix sockets aren't available on every system
+    if not hasattr(asyncio, "open_unix_connection"):
+        return None
+
+    try:
+        reader, writer = await asyncio.open_unix_connection(
+            path or get_socket_path(), limit=MESSAGE_LIMIT)
+    except OSError:
+        return None
+
+    return DaemonClient(reader, writer)
+
+
+async def get_calculator() -> DaemonClient | upsilon_py.NumWorks:
+    """Get the calculator through the daemon if it's running.
+
+    Otherwise, connect to the calculator directly.
+    """
+    if (client := await connect()) is not None:
+        logger.debug("Using the calculator daemon.")
+        return client
+
+    calculator = upsilon_py.NumWorks()
+    await calculator.start()
+
+    print("Please plug your calculator to your computer.")
+    await calculator.connect()
+
+    return calculator
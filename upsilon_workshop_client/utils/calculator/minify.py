@@ -0,0 +1,242 @@
+"""Client for the Upsilon Workshop - Python scripts minifier."""
+import ast
+import builtins
+import io
+import itertools
+import keyword
+import logging
+import string
+import tokenize
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Nodes with their own scope
+SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef,
+          ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+# Functions accessing the local variables by name
+INTROSPECTION_FUNCTIONS = {"locals", "vars", "dir", "eval", "exec"}
+
+
+def minify(source: str, rename_locals: bool = False) -> str:
+    """Minify a script, keeping its behaviour.
+
+    The docstrings and comments are removed, the indentation is reduced to a
+    space by level and the spaces between the tokens are removed when not
+    needed. The local variables of the functions can also be renamed. The
+    output only uses the syntax of the input, so it runs on MicroPython.
+    """
+    tree = ast.parse(source)
+    remove_docstrings(tree)
+
+    if rename_locals:
+        rename_local_variables(tree)
+
+    minified = compact(ast.unparse(tree))
+
+    # Ensure the minified script is the same program
+    if ast.dump(ast.parse(minified)) != ast.dump(tree):
+        logger.error("Minification changed the script")
+        raise ValueError("Minification changed the script")
+
+    return minified
+
+
+def remove_docstrings(tree: ast.AST) -> None:
+    """Remove the docstrings, and the other strings used as comments."""
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            body = getattr(node, field, None)
+            if not isinstance(body, list) or not body or\
+                    not isinstance(body[0], ast.stmt):
+                continue
+
+            body[:] = [
+                statement for statement in body
+                if not (isinstance(statement, ast.Expr)
+                        and isinstance(statement.value, ast.Constant)
+                        and isinstance(statement.value.value, str))
+            ]
+
+            # A block can't be empty (the module and the else blocks can)
+            if not body and field != "orelse" and\
+                    not isinstance(node, ast.Module):
+                body.append(ast.Pass())
+
+
+def compact(source: str) -> str:
+    """Remove the spaces that aren't needed, and indent by one space."""
+    lines: list[str] = []
+    line = ""
+    depth = 0
+    previous = ""
+
+    for text, token_type in iter_tokens(source):
+        if token_type == tokenize.INDENT:
+            depth += 1
+        elif token_type == tokenize.DEDENT:
+            depth -= 1
+        elif token_type in (tokenize.NEWLINE, tokenize.NL):
+            if line:
+                lines.append(line)
+            line = ""
+        elif token_type not in (tokenize.COMMENT, tokenize.ENDMARKER):
+            if not line:
+                line = " " * depth
+            elif needs_space(previous, text):
+                line += " "
+            line += text
+            previous = text
+
+    return "\n".join(lines) + "\n"
+
+
+def iter_tokens(source: str) -> Iterator[tuple[str, int]]:
+    """Iterate over the tokens of a script, with their exact source text.
+
+    The f-strings (split in several tokens since Python 3.12) are kept whole.
+    """
+    lines = source.splitlines(keepends=True)
+    offsets = [0, *itertools.accumulate(len(line) for line in lines)]
+
+    def get_offset(position: tuple[int, int]) -> int:
+        """Get the offset in the source of a (row, column) position."""
+        return offsets[position[0] - 1] + position[1]
+
+    fstring_start = getattr(tokenize, "FSTRING_START", None)
+    fstring_end = getattr(tokenize, "FSTRING_END", None)
+    nesting = 0
+    start = 0
+
+    for token in tokenize.generate_tokens(io.StringIO(source).readline):
+        if token.type == fstring_start:
+            if nesting == 0:
+                start = get_offset(token.start)
+            nesting += 1
+        elif token.type == fstring_end:
+            nesting -= 1
+            if nesting == 0:
+                yield source[start:get_offset(token.end)], tokenize.STRING
+        elif nesting == 0:
+            yield token.string, token.type
+
+
+def needs_space(previous: str, text: str) -> bool:
+    """Check if two tokens must be separated by a space."""
+    word = string.ascii_letters + string.digits + "_"
+    previous_is_word = previous[-1] in word or not previous[-1].isascii()
+    text_is_word = text[0] in word or not text[0].isascii()
+
+    return (previous_is_word and (text_is_word or text[0] in "'\"")) or\
+        (previous[-1] in "'\"" and text_is_word)
+
+
+def rename_local_variables(tree: ast.AST) -> None:
+    """Rename the local variables of the functions to short names.
+
+    The arguments are kept (they can be passed by keyword), and so are the
+    variables used by nested scopes and the ones of the functions looking
+    up their variables by name (locals(), eval()...).
+    """
+    reserved = get_identifiers(tree) | set(keyword.kwlist) | set(dir(builtins))
+    names = (name for size in itertools.count(1)
+             for name in map("".join, itertools.product(string.ascii_letters,
+                                                        repeat=size))
+             if name not in reserved)
+
+    for function in ast.walk(tree):
+        if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+
+        scope, nested = split_scope(function)
+
+        # Skip the functions looking up their variables by name
+        if any(isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+               and node.func.id in INTROSPECTION_FUNCTIONS
+               for node in ast.walk(function)):
+            continue
+
+        # Names that must be kept
+        kept = {argument.arg for argument in ast.walk(function.args)
+                if isinstance(argument, ast.arg)}
+        for node in nested:
+            kept |= get_identifiers(node)
+        for node in scope:
+            if isinstance(node, (ast.Global, ast.Nonlocal)):
+                kept.update(node.names)
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                kept.update((alias.asname or alias.name).split(".")[0]
+                            for alias in node.names)
+            elif isinstance(node, (ast.MatchAs, ast.MatchStar,
+                                   ast.MatchMapping)):
+                # Pattern captures aren't ast.Name nodes
+                kept |= get_identifiers(node)
+
+        # Variables assigned in the function, so local to the whole function
+        variables = {node.id for node in scope
+                     if isinstance(node, ast.Name)
+                     and isinstance(node.ctx, (ast.Store, ast.Del))}
+        variables |= {node.name for node in scope
+                      if isinstance(node, ast.ExceptHandler) and node.name}
+
+        renames: dict[str, str] = {}
+        for variable in sorted(variables - kept):
+            name = next(names)
+            if len(name) >= len(variable):
+                continue
+            renames[variable] = name
+
+        for node in scope:
+            if isinstance(node, ast.Name) and node.id in renames:
+                node.id = renames[node.id]
+            elif isinstance(node, ast.ExceptHandler) and node.name in renames:
+                node.name = renames[node.name]
+
+
+def split_scope(function: ast.FunctionDef | ast.AsyncFunctionDef)\
+        -> tuple[list[ast.AST], list[ast.AST]]:
+    """Split the body of a function in its own nodes and the nested scopes."""
+    scope: list[ast.AST] = []
+    nested: list[ast.AST] = []
+
+    stack: list[ast.AST] = list(function.body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, SCOPES):
+            nested.append(node)
+            continue
+
+        scope.append(node)
+        stack.extend(ast.iter_child_nodes(node))
+
+    return scope, nested
+
+
+def get_identifiers(tree: ast.AST) -> set[str]:
+    """Get every identifier used in a tree."""
+    identifiers: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            identifiers.add(node.id)
+        elif isinstance(node, ast.arg):
+            identifiers.add(node.arg)
+        elif isinstance(node, ast.Attribute):
+            identifiers.add(node.attr)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef,
+                               ast.ClassDef)):
+            identifiers.add(node.name)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            identifiers.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            identifiers.update(node.names)
+        elif isinstance(node, ast.alias):
+            identifiers.add((node.asname or node.name).split(".")[0])
+        elif isinstance(node, ast.keyword) and node.arg:
+            identifiers.add(node.arg)
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            identifiers.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            identifiers.add(node.rest)
+
+    return identifiers
@@ -0,0 +1,208 @@
+"""Client for the Upsilon Workshop - Calculator backup repository."""
+import datetime
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import zlib
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Version of the repository format
+REPOSITORY_VERSION = 1
+
+# Compression level of the records
+COMPRESSION_LEVEL = 9
+
+# Format of the snapshot identifiers (the creation date)
+SNAPSHOT_DATE_FORMAT = "%Y%m%dT%H%M%S%f"
+
+
+def is_repository(path: str) -> bool:
+    """Check if a directory is a backup repository."""
+    return os.path.isfile(os.path.join(path, "repository.json"))
+
+
+def init_repository(path: str) -> None:
+    """Create the repository if needed, and check its version.
+
+    A repository holds the records in `objects/`, compressed and named after
+    the hash of their content, so a record shared by several snapshots (or
+    calculators) is stored once, and the snapshots in `snapshots/`, as
+    manifests listing the hashes of their records.
+    """
+    config_path = os.path.join(path, "repository.json")
+
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            version = json.load(f)["version"]
+    except FileNotFoundError:
+        if os.path.exists(path) and os.listdir(path):
+            logger.error("%s is not a backup repository", path)
+            raise ValueError(f"{path} is not an empty directory or a backup "
+                             "repository (the backups made before the "
+                             "repositories can be uploaded with `calculator "
+                             "upload`, choose another directory for the new "
+                             "ones)") from None
+
+        logger.debug("Creating the repository %s", path)
+        os.makedirs(os.path.join(path, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(path, "snapshots"), exist_ok=True)
+        write_atomically(config_path, json.dumps(
+            {"version": REPOSITORY_VERSION}, indent=4).encode("utf-8"))
+        return
+
+    if version != REPOSITORY_VERSION:
+        logger.error("Unsupported repository version %s", version)
+        raise ValueError(f"Unsupported repository version {version}")
+
+
+def write_atomically(path: str, content: bytes) -> None:
+    """Write a file through a temporary file, so it's never half written."""
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as f:
+            f.write(content)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def get_object_path(path: str, record_hash: str) -> str:
+    """Get the path of a record in the repository."""
+    return os.path.join(path, "objects", record_hash[:2], record_hash[2:])
+
+
+def store_record(path: str, record: dict) -> tuple[str, bool]:
+    """Store a record, return its hash and whether it has been written."""
+    # Serialize every field, so any kind of record is kept
+    content = json.dumps(record, sort_keys=True,
+                         separators=(",", ":")).encode("utf-8")
+    record_hash = hashlib.sha256(content).hexdigest()
+
+    object_path = get_object_path(path, record_hash)
+    if os.path.exists(object_path):
+        return record_hash, False
+
+    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+    write_atomically(object_path, zlib.compress(content, COMPRESSION_LEVEL))
+
+    return record_hash, True
+
+
+def load_record(path: str, record_hash: str) -> dict:
+    """Load a record, and verify its content."""
+    with open(get_object_path(path, record_hash), "rb") as f:
+        content = zlib.decompress(f.read())
+
+    if hashlib.sha256(content).hexdigest() != record_hash:
+        logger.error("Record %s is corrupted", record_hash)
+        raise ValueError(f"Record {record_hash} is corrupted")
+
+    return json.loads(content)
+
+
+def save_snapshot(path: str, storage: dict, name: str = "calculator")\
+        -> tuple[str, int]:
+    """Save the storage of a calculator as a new snapshot.
+
+    Return the identifier of the snapshot and the number of records written
+    (the ones not already in the repository).
+    """
+    if not re.fullmatch(r"[\w.-]+", name):
+        logger.error("Invalid calculator name %s", name)
+        raise ValueError(f"Invalid calculator name {name} (only letters, "
+                         "digits, '_', '.' and '-' are allowed)")
+
+    init_repository(path)
+
+    records = []
+    written = 0
+    for record in storage["records"]:
+        record_hash, is_new = store_record(path, record)
+        written += is_new
+        records.append({"name": record.get("name"),
+                        "type": record.get("type"), "hash": record_hash})
+
+    created = datetime.datetime.now(datetime.timezone.utc)
+    snapshot_id = f"{name}-{created.strftime(SNAPSHOT_DATE_FORMAT)}"
+    manifest = {
+        "name": name,
+        "created": created.isoformat(),
+        # The other fields of the storage (magic number...)
+        "storage": {key: value for key, value in storage.items()
+                    if key != "records"},
+        "records": records,
+    }
+
+    # The manifest is written last, so a snapshot only exists once complete
+    write_atomically(
+        os.path.join(path, "snapshots", f"{snapshot_id}.json"),
+        json.dumps(manifest, indent=4).encode("utf-8"),
+    )
+
+    logger.info("Snapshot %s saved (%s of %s records written)", snapshot_id,
+                written, len(records))
+
+    return snapshot_id, written
+
+
+def list_snapshots(path: str, name: Optional[str] = None)\
+        -> list[dict[str, str | int]]:
+    """List the snapshots (of a calculator), from the oldest."""
+    snapshots = []
+    try:
+        files = sorted(os.listdir(os.path.join(path, "snapshots")))
+    except FileNotFoundError:
+        logger.error("%s is not a backup repository", path)
+        raise ValueError(f"{path} is not a backup repository") from None
+
+    for file in files:
+        match = re.fullmatch(r"(.+)-(\d{8}T\d{12})\.json", file)
+        if match is None or (name is not None and match[1] != name):
+            continue
+
+        manifest = load_manifest(path, file[:-len(".json")])
+        snapshots.append({
+            "id": file[:-len(".json")],
+            "name": manifest["name"],
+            "created": manifest["created"],
+            "records": len(manifest["records"]),
+        })
+
+    return sorted(snapshots, key=lambda snapshot: snapshot["created"])
+
+
+def load_manifest(path: str, snapshot_id: str) -> dict:
+    """Load the manifest of a snapshot."""
+    try:
+        with open(os.path.join(path, "snapshots", f"{snapshot_id}.json"),
+                  "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logger.error("Snapshot %s not found", snapshot_id)
+        raise ValueError(f"Snapshot {snapshot_id} not found") from None
+
+
+def load_snapshot(path: str, snapshot_id: Optional[str] = None,
+                  name: Optional[str] = None) -> dict:
+    """Load the storage of a snapshot (the latest one by default)."""
+    if snapshot_id is None:
+        snapshots = list_snapshots(path, name)
+        if not snapshots:
+            logger.error("No snapshot in %s", path)
+            raise ValueError(f"No snapshot in {path}")
+        snapshot_id = snapshots[-1]["id"]
+
+    manifest = load_manifest(path, snapshot_id)
+
+    storage = dict(manifest["storage"])
+    storage["records"] = [load_record(path, record["hash"])
+                          for record in manifest["records"]]
+
+    return storage
@@ -1,33 +1,60 @@
-"""Client for the Upsilon Workshop - Calculator backup handler."""
+"""Client for the Upsilon Workshop - Calculator upload handler."""
 import logging
 import os
 
-import upsilon_py
+import rich
+import rich.box
+import rich.table
+
+import upsilon_workshop_client.utils.calculator.daemon
+import upsilon_workshop_client.utils.calculator.minify
+import upsilon_workshop_client.utils.calculator.repository
 
 logger = logging.getLogger(__name__)
 
 
-async def upload(path: str) -> None:
-    """Backup the calculator."""
-    logger.info("Uploading %s to the calculator...", path)
+async def upload(path: str, minify: bool = False,
+                 rename_locals: bool = False) -> None:
+    """Upload a script, or the scripts of a directory, to the calculator.
 
-    # Get the calculator
-    calculator = upsilon_py.NumWorks()
-    await calculator.start()
+    The scripts can be minified first, to save storage and transfer time.
+    """
+    # The snapshots of a repository are restored, not uploaded as scripts
+    if upsilon_workshop_client.utils.calculator.repository.is_repository(
+            path):
+        logger.error("%s is a backup repository", path)
+        raise ValueError(f"{path} is a backup repository, restore one of its "
+                         "snapshots with `calculator restore` instead")
+
+    logger.info("Uploading %s to the calculator...", path)
 
-    print("Please plug your calculator to your computer.")
-    await calculator.connect()
+    # Get the calculator, through the daemon if it's running
+    calculator = await upsilon_workshop_client.utils.calculator.daemon.\
+        get_calculator()
 
-    # Backup the calculator
+    # Read the storage, to only send it if something changes
     storage = await calculator.backup_storage()
+    records = index_records(storage)
 
     # If the path is a directory, upload all the files in the directory
     if os.path.isdir(path):
-        for file in os.listdir(path):
-            add_file(os.path.join(path, file), storage)
+        files = [os.path.join(path, file) for file in sorted(os.listdir(path))
+                 if os.path.isfile(os.path.join(path, file))]
     else:
-        # Add the file to the storage
-        add_file(path, storage)
+        files = [path]
+
+    changed = False
+    sizes: dict[str, tuple[int, int]] = {}
+    for file in files:
+        code = read_script(file, minify, rename_locals, sizes)
+        changed |= add_file(file, code, storage, records)
+
+    if not changed:
+        logger.info("The calculator is already up to date.")
+        print("The calculator is already up to date.")
+        return
+
+    display_storage_usage(sizes, storage)
 
     # Upload the storage
     await calculator.install_storage(storage)
@@ -35,50 +62,95 @@ async def upload(path: str) -> None:
     logger.info("File %s uploaded to the calculator.", path)
 
 
-def add_file(path, storage) -> None:
-    """Add the file to the storage."""
-    # Get the records
-    records = storage["records"]
+def read_script(path: str, minify: bool, rename_locals: bool,
+                sizes: dict[str, tuple[int, int]]) -> str:
+    """Read a script, minified if asked, and record its size before/after."""
+    with open(path, "r", encoding="utf-8") as file:
+        code = file.read()
 
-    # Create the file
-    record = {
-        "name": os.path.basename(path).split(".")[0],
-        "type": "py",
-        "code": "",
-        "autoImport": True,
-    }
-    # Ensure that the file is not already in the storage
-    file_in_storage = False
-    for file in records:
-        if file["name"] == os.path.basename(path).split(".")[0]:
-            file_in_storage = True
-            break
-
-    if file_in_storage:
-        overwrite = input(f"File {os.path.basename(path)} already exists in "
-                          "the storage. Overwrite? [y/N] ")
-        if overwrite.lower() != "y":
-            return
+    if not minify or not path.endswith(".py"):
+        return code
+
+    try:
+        minified = upsilon_workshop_client.utils.calculator.minify.minify(
+            code, rename_locals)
+    except (SyntaxError, ValueError) as error:
+        logger.warning("Failed to minify %s (%s), uploading it as is.",
+                       path, error)
+        return code
+
+    sizes[os.path.basename(path)] = (len(code.encode("utf-8")),
+                                     len(minified.encode("utf-8")))
 
-        # Save the file metadata
-        if "autoImport" in file:
-            file["autoImport"] = file["autoImport"]
+    return minified
 
-        # Delete the file from the storage
-        del records[records.index(file)]
 
-        logger.info("File %s deleted from the storage.",
-                    os.path.basename(path))
+def get_record_size(record: dict) -> int:
+    """Get the size of a script in the storage of the calculator.
 
-    # Get the file name
+    A record holds its size (2 bytes), its name with the extension and its
+    content (the auto import flag and the code), null-terminated.
+    """
+    name = f"{record['name']}.{record['type']}".encode("utf-8")
+    return 2 + len(name) + 1 + 1 + len(record["code"].encode("utf-8")) + 1
+
+
+def display_storage_usage(sizes: dict[str, tuple[int, int]],
+                          storage: dict) -> None:
+    """Display the bytes saved by the minification, and the storage used."""
+    if sizes:
+        table = rich.table.Table("File", "Original", "Minified", "Saved",
+                                 title="Minification",
+                                 box=rich.box.HORIZONTALS)
+        for file, (original, minified) in sizes.items():
+            table.add_row(file, str(original), str(minified),
+                          f"{original - minified} "
+                          f"({(original - minified) / (original or 1):.0%})")
+        rich.print(table)
+
+    used = sum(get_record_size(record) for record in storage["records"]
+               if "code" in record)
+    rich.print(f"The scripts will use {used} bytes of the calculator "
+               "storage.")
+
+
+def index_records(storage: dict) -> dict[tuple[str, str], dict]:
+    """Index the records of the storage by name and type."""
+    return {(record["name"], record["type"]): record
+            for record in storage["records"]}
+
+
+def add_file(path: str, code: str, storage: dict,
+             records: dict[tuple[str, str], dict]) -> bool:
+    """Add the file to the storage, return True if the storage changed."""
     file_name = os.path.basename(path)
+    name = file_name.split(".")[0]
 
-    # Get the file content
-    with open(path, "rb") as file:
-        file_content = str(file.read()).replace("b'", "").replace("'", "")\
-            .replace("\\n", "\n")
+    record = records.get((name, "py"))
+    if record is not None:
+        # Ensure that the file is not already in the storage
+        if record.get("code") == code:
+            logger.debug("File %s is unchanged.", file_name)
+            return False
 
-    record["code"] = file_content
+        overwrite = input(f"File {file_name} already exists in the storage. "
+                          "Overwrite? [y/N] ")
+        if overwrite.lower() != "y":
+            return False
+
+        # Replace the code in place, keeping the file metadata
+        record["code"] = code
+        logger.info("File %s updated in the storage.", file_name)
+        return True
 
     # Add the file to the storage
-    records.append(record)
+    record = {
+        "name": name,
+        "type": "py",
+        "code": code,
+        "autoImport": True,
+    }
+    storage["records"].append(record)
+    records[(name, "py")] = record
+
+    return True
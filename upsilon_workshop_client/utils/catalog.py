@@ -0,0 +1,224 @@
+"""Client for the Upsilon Workshop - Offline project catalog."""
+# Standard Library
+import logging
+import os
+import sqlite3
+from typing import Iterable, Iterator, Optional
+
+# Internal
+import upsilon_workshop_client.api.cache
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.api.project
+import upsilon_workshop_client.api.search
+
+logger = logging.getLogger(__name__)
+
+# Fields of the projects stored in the catalog
+FIELDS = (
+    "url", "name", "created", "modified", "language", "version",
+    "short_description", "long_description", "ratings", "author", "licence",
+    "compatibility", "views",
+)
+
+# Fields of the projects indexed for the full-text search
+INDEXED_FIELDS = (
+    "name", "short_description", "long_description", "author", "language",
+    "compatibility",
+)
+
+# Insert or update a project, keeping its rowid
+UPSERT_PROJECT = (
+    f"INSERT INTO projects ({', '.join(FIELDS)}) "
+    f"VALUES ({', '.join(':' + field for field in FIELDS)}) "
+    f"ON CONFLICT(url) DO UPDATE SET "
+    + ", ".join(f"{field} = excluded.{field}" for field in FIELDS[1:])
+)
+
+# Insert or replace the index row of a project
+REPLACE_INDEX = (
+    f"INSERT OR REPLACE INTO projects_index "
+    f"(rowid, {', '.join(INDEXED_FIELDS)}) "
+    f"VALUES (:rowid, {', '.join(':' + field for field in INDEXED_FIELDS)})"
+)
+
+
+def get_catalog_path() -> str:
+    """Get the path of the catalog database."""
+    return os.path.join(
+        upsilon_workshop_client.api.cache.get_cache_directory(),
+        "catalog.sqlite3"
+    )
+
+
+def open_catalog(path: Optional[str] = None) -> sqlite3.Connection:
+    """Open the catalog database, creating it if needed."""
+    if path is None:
+        path = get_catalog_path()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+
+    connection.execute(
+        f"CREATE TABLE IF NOT EXISTS projects "
+        f"({FIELDS[0]} TEXT PRIMARY KEY, {', '.join(FIELDS[1:])})"
+    )
+    connection.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS projects_index USING fts5("
+        f"{', '.join(INDEXED_FIELDS)}, "
+        f"tokenize='unicode61 remove_diacritics 2')"
+    )
+
+    return connection
+
+
+def add_projects(
+    connection: sqlite3.Connection,
+    projects: Iterable[upsilon_workshop_client.api.project.Project],
+    ignore_errors: bool = False,
+) -> Iterator[upsilon_workshop_client.api.project.Project]:
+    """Add the projects to the catalog, yielding them once added.
+
+    If the errors are ignored, the projects are still yielded once the
+    catalog can't be written (read-only cache directory...).
+    """
+    writable = True
+    try:
+        for count, project in enumerate(projects, 1):
+            if writable:
+                try:
+                    add_project(connection, project)
+
+                    # Commit by batches, a transaction per project is slow
+                    if count % 100 == 0:
+                        connection.commit()
+                except sqlite3.Error as error:
+                    if not ignore_errors:
+                        raise
+                    logger.warning("Failed to update the catalog: %s", error)
+                    writable = False
+
+            yield project
+    finally:
+        # Commit even if the caller stops early
+        try:
+            connection.commit()
+        except sqlite3.Error as error:
+            if not ignore_errors:
+                raise
+            logger.debug("Failed to commit the catalog: %s", error)
+
+
+def add_project(connection: sqlite3.Connection,
+                project: upsilon_workshop_client.api.project.Project) -> None:
+    """Add a project to the catalog, or update it.
+
+    The index rows share the rowid of the project rows, so updating a project
+    doesn't need to scan the index.
+    """
+    row = {
+        "url": project.url,
+        "name": project.name,
+        "created": project.created.isoformat(),
+        "modified": project.modified.isoformat(),
+        "language": project.language,
+        "version": project.version,
+        "short_description": project.short_description,
+        "long_description": project.long_description,
+        "ratings": project.ratings,
+        "author": project.author,
+        "licence": project.licence,
+        "compatibility": project.compatibility,
+        "views": project.views,
+    }
+
+    # Insert or update the project, keeping its rowid
+    connection.execute(UPSERT_PROJECT, row)
+    row["rowid"] = connection.execute(
+        "SELECT rowid FROM projects WHERE url = ?", (project.url,)
+    ).fetchone()[0]
+
+    connection.execute(REPLACE_INDEX, row)
+
+
+def update(client: upsilon_workshop_client.api.client.Client,
+           path: Optional[str] = None) -> int:
+    """Index the whole server catalog, return the number of projects."""
+    logger.info("Updating the catalog from %s...", client.url)
+
+    connection = open_catalog(path)
+
+    # Index every project, then remove the ones deleted upstream
+    seen = set()
+    for project in add_projects(
+        connection,
+        upsilon_workshop_client.api.search.iter_search_project([], client)
+    ):
+        seen.add(project.url)
+
+    with connection:
+        for rowid, url in connection.execute(
+            "SELECT rowid, url FROM projects"
+        ).fetchall():
+            if url not in seen:
+                logger.debug("Removing %s from the catalog.", url)
+                connection.execute("DELETE FROM projects WHERE rowid = ?",
+                                   (rowid,))
+                connection.execute(
+                    "DELETE FROM projects_index WHERE rowid = ?", (rowid,))
+
+    connection.close()
+
+    logger.info("Catalog updated with %s projects.", len(seen))
+
+    return len(seen)
+
+
+def build_query(keywords: list[str]) -> str:
+    """Build a full-text query matching every keyword (as a prefix)."""
+    terms = []
+    for keyword in keywords:
+        for term in keyword.split():
+            # Quote the terms so the query syntax isn't interpreted
+            terms.append('"' + term.replace('"', '""') + '"*')
+
+    return " ".join(terms)
+
+
+def search(keywords: list[str], path: Optional[str] = None,
+           max_results: Optional[int] = None)\
+        -> list[upsilon_workshop_client.api.project.Project]:
+    """Search the projects in the catalog, best matches first."""
+    logger.debug("Searching %s in the catalog...", keywords)
+
+    if path is None:
+        path = get_catalog_path()
+
+    if not os.path.exists(path):
+        logger.warning("The catalog is empty, run 'workshop update-catalog' "
+                       "or an online search first.")
+        return []
+
+    connection = open_catalog(path)
+
+    query = build_query(keywords)
+    limit = -1 if max_results is None else max_results
+
+    if query:
+        rows = connection.execute(
+            "SELECT projects.* FROM projects_index "
+            "JOIN projects ON projects.rowid = projects_index.rowid "
+            "WHERE projects_index MATCH ? ORDER BY projects_index.rank "
+            "LIMIT ?",
+            (query, limit)
+        ).fetchall()
+    else:
+        rows = connection.execute(
+            "SELECT * FROM projects ORDER BY name LIMIT ?", (limit,)
+        ).fetchall()
+
+    connection.close()
+
+    return [upsilon_workshop_client.api.project.Project(dict(row))
+            for row in rows]
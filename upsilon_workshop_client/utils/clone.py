@@ -2,28 +2,41 @@
 # Standard Library
 import logging
 import os
-import hashlib
 import json
+import re
+import threading
+import concurrent.futures
+from typing import Optional
+
+import rich
+import rich.box
+import rich.table
 
 # Internal
+import upsilon_workshop_client.api.client
 import upsilon_workshop_client.api.project
+import upsilon_workshop_client.utils.scan
+import upsilon_workshop_client.timings
 
 logger = logging.getLogger(__name__)
 
 
-def clone(project_url: str, path: str) -> None:
+def clone(project_url: str, path: str,
+          client: upsilon_workshop_client.api.client.Client) -> None:
     """Clone a project."""
     logger.info("Cloning project %s to %s...", project_url, path)
 
     # Get the project
-    project = upsilon_workshop_client.api.project.get_project(project_url)
+    project = upsilon_workshop_client.api.project.get_project(project_url,
+                                                              client)
 
     project_path = f"{path}/{project.name}"
 
     # If the path already exists, ask the user if they want to overwrite it
     if os.path.exists(project_path):
-        overwrite = input(f"Path '{project_path}' already exists. "
-                          "Overwrite? [y/N] ")
+        with upsilon_workshop_client.timings.phase("prompt"):
+            overwrite = input(f"Path '{project_path}' already exists. "
+                              "Overwrite? [y/N] ")
         if overwrite.lower() == "y":
             logger.debug("Overwriting path '%s'.", project_path)
         else:
@@ -35,6 +48,128 @@ def clone(project_url: str, path: str) -> None:
     save_project_to_directory(project, project_path)
 
 
+def is_project_reference(project: str) -> bool:
+    """Check if an argument is a project UUID or URL, rather than a path."""
+    return project.startswith(("http://", "https://", "/scripts/",
+                               "scripts/")) or\
+        re.fullmatch(r"[0-9a-fA-F]{8}(-?[0-9a-fA-F]{4}){3}-?[0-9a-fA-F]{12}",
+                     project.strip("/")) is not None
+
+
+def is_path(project: str) -> bool:
+    """Check if an argument that isn't a project reference is a path."""
+    return not is_project_reference(project) and (
+        "/" in project or os.sep in project
+        or project.startswith((".", "~")) or os.path.exists(project))
+
+
+def get_project_url(project: str) -> str:
+    """Get the project URL from a project UUID, path or URL."""
+    # Full URLs are kept as is, the client handles them
+    if not project.startswith(("http://", "https://")):
+        project = project.strip("/")
+
+        # Remove the scripts/ prefix if present, to add it back consistently
+        if project.startswith("scripts/"):
+            project = project[len("scripts/"):]
+
+        project = f"/scripts/{project}"
+
+    # Add a trailing slash to the project if not present
+    if not project.endswith("/"):
+        project += "/"
+
+    return project
+
+
+def read_project_list(path: str) -> list[str]:
+    """Read a list of projects from a file (one per line)."""
+    projects = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+
+            # Skip the empty lines and the comments
+            if not line or line.startswith("#"):
+                continue
+
+            projects.append(line)
+
+    return projects
+
+
+def clone_many(project_urls: list[str], path: str,
+               client: upsilon_workshop_client.api.client.Client,
+               jobs: int = 8, overwrite: bool = False) -> bool:
+    """Clone many projects concurrently.
+
+    Existing directories are skipped (or overwritten if asked) instead of
+    prompting, and a failure doesn't stop the other clones. Return True if
+    every project has been cloned.
+    """
+    # Clone the projects listed twice once, in the order of the arguments
+    project_urls = list(dict.fromkeys(project_urls))
+
+    logger.info("Cloning %s projects to %s...", len(project_urls), path)
+
+    # Paths claimed by a clone, to avoid two projects with the same name
+    # writing to the same directory at the same time
+    claimed_paths: set[str] = set()
+    lock = threading.Lock()
+
+    def clone_one(project_url: str) -> str:
+        """Clone a single project, return its path."""
+        project = upsilon_workshop_client.api.project.get_project(
+            project_url, client)
+
+        project_path = f"{path}/{project.name}"
+
+        with lock:
+            if project_path in claimed_paths:
+                raise FileExistsError(
+                    f"Path '{project_path}' is used by another project")
+            if os.path.exists(project_path) and not overwrite:
+                raise FileExistsError(f"Path '{project_path}' already exists")
+            claimed_paths.add(project_path)
+
+        save_project_to_directory(project, project_path)
+
+        return project_path
+
+    # Clone the projects, keeping the results in the order of the arguments
+    results: dict[str, str | Exception] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            project_url: executor.submit(clone_one, project_url)
+            for project_url in project_urls
+        }
+        for project_url, future in futures.items():
+            try:
+                results[project_url] = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                logger.debug("Failed to clone %s: %s", project_url, error)
+                results[project_url] = error
+
+    display_clone_summary(results)
+
+    return not any(isinstance(result, Exception)
+                   for result in results.values())
+
+
+def display_clone_summary(results: dict[str, str | Exception]) -> None:
+    """Display the result of each clone."""
+    table = rich.table.Table("Project", "Status", "Details", title="Clone",
+                             box=rich.box.HORIZONTALS)
+
+    for project_url, result in results.items():
+        if isinstance(result, Exception):
+            table.add_row(project_url, "[red]failed[/red]", str(result))
+        else:
+            table.add_row(project_url, "[green]cloned[/green]", result)
+
+    rich.print(table)
+
+
 def save_project_to_directory(project:
                               upsilon_workshop_client.api.project.Project,
                               path: str) -> None:
@@ -55,21 +190,29 @@ def save_project_to_directory(project:
     save_project_info(project, realpath)
 
 
-def create_readme(project: upsilon_workshop_client.api.project.Project,
-                  path: str) -> None:
-    """Create the README.md file."""
+def get_readme(project: upsilon_workshop_client.api.project.Project) -> str:
+    """Get the README.md of a project: its name and descriptions."""
     readme = f"# {project.name}\n\n"
 
     readme += f"{project.short_description}\n\n"
 
     readme += f"{project.long_description}\n"
 
+    return readme
+
+
+def create_readme(project: upsilon_workshop_client.api.project.Project,
+                  path: str) -> None:
+    """Create the README.md file."""
+    readme = get_readme(project)
+
     # If the path is a file, don't write the readme
     if os.path.isfile(path):
         return
 
     # Save the file
-    with open(f"{path}/README.md", "w", encoding="utf-8") as f:
+    with upsilon_workshop_client.timings.phase("disk"),\
+            open(f"{path}/README.md", "w", encoding="utf-8") as f:
         f.write(readme)
 
 
@@ -78,17 +221,66 @@ def create_files(project: upsilon_workshop_client.api.project.Project,
     """Create the files."""
     # Create the files
     for file in project.files:
-        with open(f"{path}/{file['name']}", "w", encoding="utf-8") as f:
-            f.write(file["content"])
+        write_file(f"{path}/{file['name']}", file["content"])
+
+
+def write_file(path: str, content: str) -> None:
+    """Write a file atomically, through a temporary file renamed in place."""
+    with upsilon_workshop_client.timings.phase("disk"):
+        # Create the subdirectories of the file if any
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        file_descriptor, temporary_path = create_temporary_file(
+            os.path.dirname(path))
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as f:
+                f.write(content)
+
+            # Keep the permissions of the replaced file, if any
+            try:
+                os.chmod(temporary_path, os.stat(path).st_mode)
+            except FileNotFoundError:
+                pass
+
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+
+def create_temporary_file(directory: str) -> tuple[int, str]:
+    """Create a hidden temporary file in a directory, return its descriptor.
+
+    Unlike with tempfile.mkstemp (always 0o600), the permissions follow the
+    umask, like the files created by open(), without changing the umask of
+    the process to read it.
+    """
+    while True:
+        path = os.path.join(directory, f".{os.urandom(8).hex()}.tmp")
+        try:
+            return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL
+                           | getattr(os, "O_BINARY", 0), 0o666), path
+        except FileExistsError:
+            continue
 
 
 def save_project_info(project: upsilon_workshop_client.api.project.Project,
-                      path: str) -> None:
-    """Save the URL to the project."""
+                      path: str,
+                      checksums: Optional[dict[str, str]] = None,
+                      readme_checksum: Optional[str] = None) -> None:
+    """Save the URL to the project.
+
+    The checksums of the synced files default to the ones of the local files
+    (the README.md included), when they're all in sync with the server.
+    """
     # If the path is a file, don't save the project info
     if os.path.isfile(path):
         return
 
+    if checksums is None:
+        checksums = generate_checksums(path)
+        readme_checksum = generate_readme_checksum(path)
+
     # Generate the JSON
     project_info = {
         "url": project.url,
@@ -97,48 +289,28 @@ def save_project_info(project: upsilon_workshop_client.api.project.Project,
         "licence": project.licence,
         "compatibility": project.compatibility,
         "modified": str(project.modified),
-        "checksums": generate_checksums(path),
+        "checksums": checksums,
+        "readme_checksum": readme_checksum,
         "file_version": 1  # May be used in the future to handle compatibility
     }
-    with open(f"{path}/.project_info.json", "w", encoding="utf-8") as f:
-        # Save the JSON
-        f.write(json.dumps(project_info, indent=4))
+    # Save the JSON
+    write_file(f"{path}/.project_info.json",
+               json.dumps(project_info, indent=4))
 
 
 def generate_checksums(path: str) -> dict[str, str]:
     """Generate the checksums of the files in the directory."""
-    # Get the real path
-    realpath = os.path.realpath(path)
+    return upsilon_workshop_client.utils.scan.generate_checksums(path)
 
-    # If the path is a file, don't generate the checksums
-    if os.path.isfile(realpath):
-        return {}
 
-    # Get the list of files
-    files = os.listdir(realpath)
-
-    # Generate the checksums
-    checksums = {}
-    for file in files:
-        # Skip the README.md and .project_info.json
-        if file in ("README.md", ".project_info.json"):
-            continue
-
-        # Generate the checksum
-        checksum = generate_checksum(f"{realpath}/{file}")
-
-        # Add the checksum to the dictionary
-        checksums[file] = checksum
-
-    return checksums
+def generate_readme_checksum(path: str) -> str | None:
+    """Generate the checksum of the README.md, which holds the metadata."""
+    try:
+        return generate_checksum(f"{os.path.realpath(path)}/README.md")
+    except (FileNotFoundError, NotADirectoryError):
+        return None
 
 
 def generate_checksum(path: str) -> str:
     """Generate the checksum of a file."""
-    # Open the file
-    with open(path, "rb") as f:
-        # Read the file
-        content = f.read()
-
-        # Generate the checksum
-        return hashlib.sha256(content).hexdigest()
+    return upsilon_workshop_client.utils.scan.hash_file(path)
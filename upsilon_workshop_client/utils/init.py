@@ -2,20 +2,23 @@
 # Standard Library
 import logging
 import os
-import getpass
 import sys
-import requests
 import json
 
 # Internal
 import upsilon_workshop_client.utils.push
 import upsilon_workshop_client.utils.clone
-import upsilon_workshop_client.api
+import upsilon_workshop_client.utils.login
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.api.project
+import upsilon_workshop_client.timings
 
 logger = logging.getLogger(__name__)
 
 
-def init(path: str, url: str) -> None:
+def init(path: str,
+         client: upsilon_workshop_client.api.client.Client,
+         assume_yes: bool = False) -> None:
     """Init a project."""
     logger.info("Initializing project %s.", path)
 
@@ -32,20 +35,22 @@ def init(path: str, url: str) -> None:
     print(f"\tDescription: {payload['description']}")
     print(f"\tLanguage: {payload['language']}")
     print(f"\tFiles: {[file['name'] for file in payload['files']]}")
-    if input("Continue? [y/N] ").lower() != "y":
-        logger.debug("Aborting.")
-        print("Aborting.")
-        return
+    if not assume_yes:
+        with upsilon_workshop_client.timings.phase("prompt"):
+            answer = input("Continue? [y/N] ")
+        if answer.lower() != "y":
+            logger.debug("Aborting.")
+            print("Aborting.")
+            return
 
-    # Ask the credentials
-    username = input("Username: ")
-    password = getpass.getpass("Password: ")
+    # Get the token, or ask the credentials
+    auth = upsilon_workshop_client.utils.login.get_auth(client)
 
     # Send the request with the credentials
-    response = requests.post(
-        f"{url}/scripts/",
+    response = client.post(
+        "/scripts/",
         json=payload,
-        auth=(username, password),
+        auth=auth,
         timeout=10
     )
 
@@ -56,12 +61,14 @@ def init(path: str, url: str) -> None:
         logger.debug("Response: %s", response.text)
     else:
         logger.error("Error while initializing the project: %s", response.text)
+        if response.status_code == 401:
+            logger.error("Log in again with 'workshop login'.")
         sys.exit(1)
 
     # Create the metadata files
-    project = upsilon_workshop_client.api.project.Project(
-        json.loads(response.text)
-    )
+    with upsilon_workshop_client.timings.phase("json"):
+        project_dict = json.loads(response.text)
+    project = upsilon_workshop_client.api.project.Project(project_dict)
 
     # Create the README.md
     upsilon_workshop_client.utils.clone.create_readme(project, path)
@@ -0,0 +1,315 @@
+"""Client for the Upsilon Workshop - Server load testing handler."""
+# Standard Library
+import collections
+import concurrent.futures
+import json
+import logging
+import math
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+import rich
+import rich.box
+import rich.table
+
+# Internal
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.api.project
+import upsilon_workshop_client.api.search
+import upsilon_workshop_client.utils.clone
+import upsilon_workshop_client.utils.login
+
+logger = logging.getLogger(__name__)
+
+# Requests that can be replayed
+OPERATIONS = ("search", "get", "push")
+
+# Percentiles of the latencies displayed
+PERCENTILES = (50, 95, 99)
+
+# Number of projects picked from by the "get" requests
+MAX_PROJECTS = 100
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    """Parse a request mix, like `search=8,get=2`, into weights."""
+    weights: dict[str, int] = {}
+    for item in mix.split(","):
+        operation, _, weight = item.partition("=")
+        operation = operation.strip()
+
+        if operation not in OPERATIONS:
+            logger.error("Unknown request %s in the mix", operation)
+            raise ValueError(f"Unknown request {operation} in the mix "
+                             f"(expected one of {', '.join(OPERATIONS)})")
+
+        try:
+            weights[operation] = int(weight or 1)
+        except ValueError:
+            logger.error("Invalid weight %s in the mix", weight)
+            raise ValueError(f"Invalid weight {weight} in the mix") from None
+
+        if weights[operation] < 0:
+            logger.error("Negative weight %s in the mix", weight)
+            raise ValueError(f"Negative weight {weight} in the mix")
+
+    # Drop the disabled requests
+    weights = {operation: weight for operation, weight in weights.items()
+               if weight > 0}
+    if not weights:
+        logger.error("The mix doesn't contain any request")
+        raise ValueError("The mix doesn't contain any request")
+
+    return weights
+
+
+def get_percentile(latencies: list[float], percent: float) -> float:
+    """Get a percentile of sorted latencies (nearest rank)."""
+    if not latencies:
+        return 0.0
+
+    rank = math.ceil(percent / 100 * len(latencies)) - 1
+    return latencies[max(0, rank)]
+
+
+class LoadTest:
+    """Replay a mix of requests against the server, and record the results.
+
+    The requests are sent by `concurrency` workers, each sending its next
+    request as soon as the previous one is answered, or at a fixed total rate
+    if one is given. With a rate, the latency is measured from the time the
+    request was scheduled, so the time spent waiting for a free worker when
+    the server falls behind is counted too.
+    """
+
+    def __init__(self, client: upsilon_workshop_client.api.client.Client,
+                 weights: dict[str, int], keywords: list[str],
+                 projects: list[str],
+                 push_payload: Optional[dict] = None) -> None:
+        """Initialize the class."""
+        self.client = client
+        self.operations = list(weights)
+        self.weights = list(weights.values())
+        self.keywords = keywords or [""]
+        self.projects = projects
+        self.push_payload = push_payload
+
+        # Latencies of the requests, and the errors, by request type
+        self.latencies: dict[str, list[float]] = collections.defaultdict(list)
+        self.errors: dict[str, collections.Counter] = collections.defaultdict(
+            collections.Counter)
+
+        self.lock = threading.Lock()
+        self.sent = 0
+
+    def get_next(self, start: float, duration: float,
+                 max_requests: Optional[int],
+                 rate: Optional[float]) -> Optional[float]:
+        """Get the time the next request is scheduled at, None if done."""
+        with self.lock:
+            if max_requests is not None and self.sent >= max_requests:
+                return None
+
+            if rate:
+                scheduled = start + self.sent / rate
+            else:
+                scheduled = time.perf_counter()
+            if scheduled - start >= duration:
+                return None
+
+            self.sent += 1
+            return scheduled
+
+    def send(self, operation: str) -> requests.Response:
+        """Send a request of a type."""
+        if operation == "search":
+            return self.client.get(
+                "/scripts/", params={"search": random.choice(self.keywords)})
+
+        if operation == "get":
+            return self.client.get(random.choice(self.projects))
+
+        return self.client.put(self.push_payload["url"],
+                               json=self.push_payload,
+                               auth=self.client.auth)
+
+    def worker(self, start: float, duration: float,
+               max_requests: Optional[int], rate: Optional[float]) -> None:
+        """Send requests until the end of the test."""
+        while (scheduled := self.get_next(start, duration, max_requests,
+                                          rate)) is not None:
+            # Wait for the scheduled time
+            if (delay := scheduled - time.perf_counter()) > 0:
+                time.sleep(delay)
+
+            operation = random.choices(self.operations, self.weights)[0]
+            try:
+                response = self.send(operation)
+                error = None if response.status_code < 400\
+                    else f"HTTP {response.status_code}"
+            except requests.RequestException as exception:
+                error = exception.__class__.__name__
+
+            latency = time.perf_counter() - scheduled
+            with self.lock:
+                self.latencies[operation].append(latency)
+                if error is not None:
+                    self.errors[operation][error] += 1
+
+    def run(self, duration: float, max_requests: Optional[int] = None,
+            concurrency: int = 8, rate: Optional[float] = None) -> float:
+        """Run the test, return its duration."""
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=concurrency) as executor:
+            futures = [executor.submit(self.worker, start, duration,
+                                       max_requests, rate)
+                       for _ in range(concurrency)]
+            for future in futures:
+                future.result()
+
+        return time.perf_counter() - start
+
+    def get_results(self, elapsed: float) -> dict:
+        """Summarize the results: throughput, errors and latencies."""
+        results: dict = {
+            "duration": elapsed,
+            "requests": sum(map(len, self.latencies.values())),
+            "errors": sum(sum(errors.values())
+                          for errors in self.errors.values()),
+            "operations": {},
+        }
+        results["throughput"] = results["requests"] / (elapsed or 1)
+
+        for operation in self.operations:
+            latencies = sorted(self.latencies[operation])
+            errors = self.errors[operation]
+            results["operations"][operation] = {
+                "requests": len(latencies),
+                "errors": sum(errors.values()),
+                "error_kinds": dict(errors),
+                "throughput": len(latencies) / (elapsed or 1),
+                **{f"p{percent}": get_percentile(latencies, percent)
+                   for percent in PERCENTILES},
+                "max": latencies[-1] if latencies else 0.0,
+            }
+
+        return results
+
+
+def loadtest(client: upsilon_workshop_client.api.client.Client,
+             mix: str = "search=4,get=6", duration: float = 30,
+             max_requests: Optional[int] = None, concurrency: int = 8,
+             rate: Optional[float] = None,
+             keywords: Optional[list[str]] = None,
+             push_project: Optional[str] = None,
+             report: Optional[str] = None) -> bool:
+    """Load test the server with a mix of requests.
+
+    The searches use the given keywords, the project fetches pick projects
+    from the first page of the catalog, and the pushes send the current
+    content of a project back, so they don't change it. Return True if no
+    request failed.
+    """
+    weights = parse_mix(mix)
+    if "push" in weights and push_project is None:
+        logger.error("A project to push to is needed to replay pushes.")
+        raise ValueError("A project to push to is needed to replay pushes")
+
+    # Use a client of its own, with a connection by worker and no cache (the
+    # server must answer every request)
+    load_client = upsilon_workshop_client.api.client.Client(
+        client.url, pool_size=concurrency, timeout=client.timeout)
+
+    try:
+        projects: list[str] = []
+        if "get" in weights:
+            projects = [project.url for project in upsilon_workshop_client.
+                        api.search.iter_search_project(
+                            [], load_client, MAX_PROJECTS)]
+            if not projects:
+                logger.error("No project found to fetch.")
+                raise ValueError("No project found to fetch")
+
+        push_payload = None
+        if "push" in weights:
+            push_payload = get_push_payload(push_project, load_client)
+            load_client.auth = upsilon_workshop_client.utils.login.get_auth(
+                client)
+
+        logger.info("Load testing %s for %ss with %s workers...",
+                    client.url, duration, concurrency)
+
+        test = LoadTest(load_client, weights, keywords or [], projects,
+                        push_payload)
+        results = test.get_results(test.run(duration, max_requests,
+                                            concurrency, rate))
+    finally:
+        load_client.close()
+
+    display_results(results)
+
+    if report is not None:
+        with open(report, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+        logger.info("Report written to %s.", report)
+
+    return results["errors"] == 0
+
+
+def get_push_payload(project: str,
+                     client: upsilon_workshop_client.api.client.Client)\
+        -> dict[str, str | list[dict[str, str]]]:
+    """Get the payload pushing the current content of a project back."""
+    project_object = upsilon_workshop_client.api.project.get_project(
+        upsilon_workshop_client.utils.clone.get_project_url(project), client)
+
+    # The description pushed is the README.md of a clone without its first
+    # line (the name), like a push sends it
+    readme = upsilon_workshop_client.utils.clone.get_readme(project_object)
+
+    return {
+        "url": project_object.url,
+        "name": project_object.name,
+        "description": readme.partition("\n")[2].strip(),
+        "language": project_object.language,
+        "version": project_object.version,
+        "licence": project_object.licence,
+        "compatibility": project_object.compatibility,
+        "files": project_object.files,
+    }
+
+
+def display_results(results: dict) -> None:
+    """Display the throughput, the errors and the latencies."""
+    table = rich.table.Table(
+        "Request", "Count", "Req/s", "Errors",
+        *(f"p{percent}" for percent in PERCENTILES), "Max",
+        title="Load test", box=rich.box.HORIZONTALS)
+
+    for operation, stats in results["operations"].items():
+        table.add_row(
+            operation,
+            str(stats["requests"]),
+            f"{stats['throughput']:.1f}",
+            f"{stats['errors']} "
+            f"({stats['errors'] / (stats['requests'] or 1):.1%})",
+            *(f"{stats[f'p{percent}'] * 1000:.1f} ms"
+              for percent in PERCENTILES),
+            f"{stats['max'] * 1000:.1f} ms",
+        )
+
+    rich.print(table)
+
+    for operation, stats in results["operations"].items():
+        for error, count in stats["error_kinds"].items():
+            rich.print(f"[red]{operation}: {count} x {error}[/red]")
+
+    rich.print(f"{results['requests']} requests in "
+               f"{results['duration']:.1f}s: "
+               f"{results['throughput']:.1f} requests/s, "
+               f"{results['errors']} errors "
+               f"({results['errors'] / (results['requests'] or 1):.1%})")
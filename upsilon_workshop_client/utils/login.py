@@ -0,0 +1,70 @@
+"""Client for the Upsilon Workshop - Authentication handler."""
+# Standard Library
+import getpass
+import logging
+import sys
+from typing import Optional
+
+import requests.auth
+
+# Internal
+import upsilon_workshop_client.api.auth
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.timings
+
+logger = logging.getLogger(__name__)
+
+
+def login(client: upsilon_workshop_client.api.client.Client,
+          username: Optional[str] = None) -> None:
+    """Log in to the server and store the token."""
+    logger.info("Logging in to %s.", client.url)
+
+    # Ask the credentials
+    with upsilon_workshop_client.timings.phase("prompt"):
+        if username is None:
+            username = input("Username: ")
+
+        # Password is hidden
+        password = getpass.getpass("Password: ")
+
+    try:
+        upsilon_workshop_client.api.auth.login(username, password, client)
+    except ValueError:
+        sys.exit(1)
+
+    logger.info("Logged in, the token is stored in %s.",
+                upsilon_workshop_client.api.auth.get_credentials_path())
+
+
+def logout(client: upsilon_workshop_client.api.client.Client) -> None:
+    """Remove the stored token of the server."""
+    if upsilon_workshop_client.api.auth.logout(client):
+        logger.info("Logged out from %s.", client.url)
+    else:
+        logger.info("Not logged in to %s.", client.url)
+
+
+def get_auth(client: upsilon_workshop_client.api.client.Client)\
+        -> requests.auth.AuthBase | tuple[str, str]:
+    """Get the authentication for the requests modifying the server.
+
+    The token from the environment or from `workshop login` is used if any,
+    otherwise the credentials are asked once and reused by the client.
+    """
+    if client.auth is not None:
+        return client.auth
+
+    if token := upsilon_workshop_client.api.auth.get_token(client):
+        client.auth = upsilon_workshop_client.api.auth.TokenAuth(token)
+        return client.auth
+
+    # Ask the credentials
+    with upsilon_workshop_client.timings.phase("prompt"):
+        username = input("Username: ")
+
+        # Password is hidden
+        password = getpass.getpass("Password: ")
+
+    client.auth = (username, password)
+    return client.auth
@@ -0,0 +1,186 @@
+"""Client for the Upsilon Workshop - Catalog mirroring handler."""
+# Standard Library
+import concurrent.futures
+import datetime
+import json
+import logging
+import os
+import shutil
+
+import rich
+import rich.box
+import rich.table
+
+# Internal
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.api.project
+import upsilon_workshop_client.api.search
+import upsilon_workshop_client.utils.clone
+
+logger = logging.getLogger(__name__)
+
+
+def mirror(path: str, client: upsilon_workshop_client.api.client.Client,
+           jobs: int = 8) -> bool:
+    """Mirror every project of the server to a directory.
+
+    Each project is saved to a directory named after its UUID. Only the new
+    projects and the ones modified since the last mirror are downloaded, and
+    the projects deleted from the server are removed. The other directories
+    (clones of projects...) are never changed. Return True if every project
+    has been mirrored.
+    """
+    logger.info("Mirroring %s to %s...", client.url, path)
+
+    realpath = os.path.realpath(path)
+    os.makedirs(realpath, exist_ok=True)
+
+    # Modification dates of the projects already mirrored
+    local_projects = read_local_projects(realpath)
+
+    results: dict[str, str | Exception] = {}
+    seen: set[str] = set()
+    complete = False
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures: dict[str, concurrent.futures.Future] = {}
+
+        # Walk the catalog, the downloads start while the pages arrive
+        try:
+            for project in upsilon_workshop_client.api.search.\
+                    iter_search_project([], client):
+                uuid = get_uuid(project)
+                seen.add(uuid)
+
+                if uuid not in local_projects:
+                    if os.path.lexists(os.path.join(realpath, uuid)):
+                        # Don't overwrite a directory not created by a mirror
+                        results[uuid] = ValueError(
+                            f"{os.path.join(realpath, uuid)} already exists "
+                            "and isn't a mirrored project")
+                        continue
+                    status = "new"
+                elif project.modified > local_projects[uuid]:
+                    status = "updated"
+                else:
+                    results[uuid] = "unchanged"
+                    continue
+
+                futures[uuid] = executor.submit(
+                    mirror_project, project.url, realpath, uuid, status,
+                    client)
+            complete = True
+        except (ValueError, OSError) as error:
+            logger.error("Failed to list the projects: %s", error)
+
+        for uuid, future in futures.items():
+            try:
+                results[uuid] = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                logger.debug("Failed to mirror %s: %s", uuid, error)
+                results[uuid] = error
+
+    # Remove the projects deleted from the server, only if the whole catalog
+    # has been listed
+    if complete:
+        for uuid in local_projects:
+            if uuid not in seen:
+                logger.debug("Removing %s.", uuid)
+                shutil.rmtree(os.path.join(realpath, uuid))
+                results[uuid] = "removed"
+
+    display_mirror_summary(results)
+
+    return complete and not any(isinstance(result, Exception)
+                                for result in results.values())
+
+
+def get_uuid(project: upsilon_workshop_client.api.project.Project) -> str:
+    """Get the UUID of a project from its URL (/scripts/UUID/)."""
+    return project.url.strip("/").split("/")[-1]
+
+
+def read_local_projects(path: str) -> dict[str, datetime.datetime]:
+    """Read the modification dates of the mirrored projects.
+
+    A mirrored project is a directory named after the UUID of the project it
+    holds, the other directories (clones named after their project...) are
+    left alone.
+    """
+    local_projects: dict[str, datetime.datetime] = {}
+
+    with os.scandir(path) as iterator:
+        for entry in iterator:
+            if not entry.is_dir(follow_symlinks=False)\
+                    or entry.name.startswith("."):
+                continue
+
+            try:
+                with open(os.path.join(entry.path, ".project_info.json"), "r",
+                          encoding="utf-8") as f:
+                    project_info = json.load(f)
+            except (OSError, ValueError):
+                # Not a project
+                continue
+
+            if not isinstance(project_info, dict)\
+                    or not isinstance(project_info.get("url"), str)\
+                    or project_info["url"].strip("/").split("/")[-1]\
+                    != entry.name:
+                logger.debug("Skipping %s, not a mirrored project.",
+                             entry.path)
+                continue
+
+            try:
+                local_projects[entry.name] = datetime.datetime.fromisoformat(
+                    project_info["modified"])
+            except (KeyError, TypeError, ValueError):
+                # Broken mirrored project, fetched again
+                local_projects[entry.name] = datetime.datetime.min.replace(
+                    tzinfo=datetime.timezone.utc)
+
+    return local_projects
+
+
+def mirror_project(project_url: str, path: str, uuid: str, status: str,
+                   client: upsilon_workshop_client.api.client.Client) -> str:
+    """Download a project and replace its mirrored copy, return the status."""
+    project = upsilon_workshop_client.api.project.get_project(project_url,
+                                                              client)
+
+    project_path = os.path.join(path, uuid)
+    temporary_path = os.path.join(path, f".{uuid}.tmp")
+    old_path = os.path.join(path, f".{uuid}.old")
+
+    # Save the project next to the mirrored copy, then swap them, so the
+    # files deleted upstream don't remain
+    shutil.rmtree(temporary_path, ignore_errors=True)
+    upsilon_workshop_client.utils.clone.save_project_to_directory(
+        project, temporary_path)
+
+    if os.path.exists(project_path):
+        shutil.rmtree(old_path, ignore_errors=True)
+        os.rename(project_path, old_path)
+        os.rename(temporary_path, project_path)
+        shutil.rmtree(old_path)
+    else:
+        os.rename(temporary_path, project_path)
+
+    return status
+
+
+def display_mirror_summary(results: dict[str, str | Exception]) -> None:
+    """Display the number of projects by status, and the failures."""
+    counts: dict[str, int] = {}
+    for result in results.values():
+        status = "failed" if isinstance(result, Exception) else result
+        counts[status] = counts.get(status, 0) + 1
+
+    table = rich.table.Table("Status", "Projects", title="Mirror",
+                             box=rich.box.HORIZONTALS)
+    for status in ("new", "updated", "unchanged", "removed", "failed"):
+        table.add_row(status, str(counts.get(status, 0)))
+    rich.print(table)
+
+    for uuid, result in results.items():
+        if isinstance(result, Exception):
+            rich.print(f"[red]{uuid}[/red]: {result}")
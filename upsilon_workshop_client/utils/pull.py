@@ -8,14 +8,17 @@ import json
 import hashlib
 
 # Internal
+import upsilon_workshop_client.api.client
 import upsilon_workshop_client.api.project
 import upsilon_workshop_client.utils.clone
+import upsilon_workshop_client.timings
 
 logger = logging.getLogger(__name__)
 
 
-def pull(path: str) -> None:
-    """Push a project."""
+def pull(path: str,
+         client: upsilon_workshop_client.api.client.Client) -> None:
+    """Pull a project."""
     logger.debug("Pulling project %s.", path)
 
     # Read the project info
@@ -23,7 +26,7 @@ def pull(path: str) -> None:
 
     # Get the project from the server
     server_project = upsilon_workshop_client.api.project.get_project(
-        project_info["url"])
+        project_info["url"], client)
 
     # Compare the modification times
     if server_project.modified > project_info["modified"]:
@@ -52,15 +55,19 @@ def read_project_info(path: str) -> dict[str, str | datetime.datetime | int]:
     realpath = os.path.realpath(path)
 
     # Get the project info
-    project_info_path = f"{realpath}/.project_info.json"
     try:
-        with open(project_info_path, "r", encoding="utf-8")\
-                as project_info_file:
-            project_info = json.load(project_info_file)
+        return load_project_info(realpath)
     except FileNotFoundError:
         logger.error("Project info file not found.")
         sys.exit(1)
 
+
+def load_project_info(path: str) -> dict[str, str | datetime.datetime | int]:
+    """Load the project info from the project, raising if not found."""
+    with open(f"{path}/.project_info.json", "r", encoding="utf-8")\
+            as project_info_file:
+        project_info = json.load(project_info_file)
+
     # Parse the modified time
     project_info["modified"] = datetime.datetime.fromisoformat(
         project_info["modified"])
@@ -77,34 +84,107 @@ def pull_project_from_server(project:
     # Get the real path
     realpath = os.path.realpath(path)
 
-    # Get the changed files
-    locally_changed_files, distantly_changed_files = get_changed_files(
-        project, project_info, realpath)
+    # Get the files to write and delete
+    plan = get_pull_plan(project, project_info, realpath)
 
-    if changed_files := [
-        file
-        for file in locally_changed_files
-        if file in distantly_changed_files
-    ]:
-        ask_for_overwrite(changed_files)
-    elif not locally_changed_files and not distantly_changed_files:
+    if plan["conflicts"]:
+        ask_for_overwrite(plan["conflicts"])
+    elif not plan["write"] and not plan["delete"]:
         logger.info("Project is up to date.")
         print("Project is up to date.")
 
-    # Save the server files to the directory
-    for server_file in project.files:
-        with open(f"{realpath}/{server_file['name']}", "w", encoding="utf-8")\
-                as file_object:
-            file_object.write(server_file["content"])
+    # Save the server files changed to the directory
+    server_files = {file["name"]: file["content"] for file in project.files}
+    for file in plan["write"]:
+        logger.debug("Writing %s.", file)
+        upsilon_workshop_client.utils.clone.write_file(
+            f"{realpath}/{file}", server_files[file])
 
     # Remove the local files that have been deleted on the server
-    for file in locally_changed_files:
-        if file not in project.files:
-            os.remove(f"{realpath}/{file}")
+    for file in plan["delete"]:
+        logger.debug("Removing %s.", file)
+        remove_file(realpath, file)
 
-    # Update the project info
+    # Update the project info, last, so an interrupted pull is pulled again
     upsilon_workshop_client.utils.clone.save_project_info(
-        project, realpath)
+        project, realpath, get_synced_checksums(project, project_info,
+                                                realpath),
+        project_info.get("readme_checksum"))
+
+
+def get_synced_checksums(project: upsilon_workshop_client.api.project.Project,
+                         project_info: dict[str, str | datetime.datetime |
+                                            int],
+                         path: str) -> dict[str, str]:
+    """Get the checksums of the files synced with the server after a pull.
+
+    The files that are the same as on the server get the server checksum.
+    The ones changed locally (and not overwritten) keep their previous
+    checksum, so they're still pushed, and the new ones stay untracked.
+    """
+    local_checksums = upsilon_workshop_client.utils.clone.generate_checksums(
+        path)
+    project_info_checksums: dict[str, str] = project_info["checksums"]
+
+    checksums: dict[str, str] = {}
+    for file, checksum in get_server_checksums(project).items():
+        if local_checksums.get(file) == checksum:
+            checksums[file] = checksum
+        elif file in project_info_checksums:
+            checksums[file] = project_info_checksums[file]
+
+    return checksums
+
+
+def get_pull_plan(project: upsilon_workshop_client.api.project.Project,
+                  project_info: dict[str, str | datetime.datetime | int],
+                  path: str) -> dict[str, list[str]]:
+    """Get the files to write and delete to apply the server changes."""
+    locally_changed_files, server_changed_files = get_changed_files(
+        project, project_info, path)
+
+    local_checksums = upsilon_workshop_client.utils.clone.generate_checksums(
+        path)
+    server_checksums = get_server_checksums(project)
+    project_info_checksums: dict[str, str] = project_info["checksums"]
+
+    # Files changed on the server, unless the local file is already the same
+    write = [
+        file
+        for file in server_changed_files
+        if local_checksums.get(file) != server_checksums[file]
+    ]
+
+    # Files deleted on the server, that still exist locally
+    delete = [
+        file
+        for file in project_info_checksums
+        if file not in server_checksums and file in local_checksums
+    ]
+
+    # Files changed on both sides
+    conflicts = [
+        file
+        for file in locally_changed_files
+        if file in write or file in delete
+    ]
+
+    return {"write": write, "delete": delete, "conflicts": conflicts}
+
+
+def remove_file(path: str, file: str) -> None:
+    """Remove a file of a project, and its parent directories if empty."""
+    with upsilon_workshop_client.timings.phase("disk"):
+        os.remove(f"{path}/{file}")
+
+        directory = os.path.dirname(file)
+        while directory:
+            try:
+                os.rmdir(f"{path}/{directory}")
+            except OSError:
+                # The directory isn't empty
+                break
+            directory = os.path.dirname(directory)
 
 
 def ask_for_overwrite(changed_files):
@@ -112,7 +192,8 @@ def ask_for_overwrite(changed_files):
     logger.warning("Files: %s", changed_files)
     logger.warning("Pulling anyway will overwrite these files.")
     logger.warning("Do you want to continue? [y/N]")
-    answer = input()
+    with upsilon_workshop_client.timings.phase("prompt"):
+        answer = input()
     if answer.lower() != "y":
         logger.info("Pull aborted.")
         print("Pull aborted.")
@@ -129,12 +210,7 @@ def get_changed_files(project:
         generate_checksums(path)
 
     # Get the checksums of the server files
-    server_checksums = {
-        file["name"]: upsilon_workshop_client.utils.clone.hashlib.sha256(
-            file["content"].encode("utf-8")
-        ).hexdigest()
-        for file in project.files
-    }
+    server_checksums = get_server_checksums(project)
 
     # Get the local checksums from the project info
     project_info_checksums: dict[str, str] = project_info["checksums"]
@@ -158,5 +234,17 @@ def get_changed_files(project:
         if file not in local_checksums:
             locally_changed_files.append(file)
 
-
     return locally_changed_files, server_changed_files
+
+
+def get_server_checksums(project:
+                         upsilon_workshop_client.api.project.Project)\
+        -> dict[str, str]:
+    """Get the checksums of the server files."""
+    with upsilon_workshop_client.timings.phase("hashing"):
+        return {
+            file["name"]: hashlib.sha256(
+                file["content"].encode("utf-8")
+            ).hexdigest()
+            for file in project.files
+        }
@@ -4,17 +4,20 @@ import logging
 import os
 import sys
 import json
-import getpass
-
-import requests
 
+import upsilon_workshop_client.api.client
 import upsilon_workshop_client.api.project
 import upsilon_workshop_client.utils.clone
+import upsilon_workshop_client.utils.login
+import upsilon_workshop_client.utils.scan
+import upsilon_workshop_client.timings
 
 logger = logging.getLogger(__name__)
 
 
-def push(path: str) -> None:
+def push(path: str,
+         client: upsilon_workshop_client.api.client.Client,
+         dry_run: bool = False) -> None:
     """Push a project."""
     logger.debug("Pushing project %s.", path)
 
@@ -23,36 +26,131 @@ def push(path: str) -> None:
     # Generate the project
     extract_project_name_and_description(path, payload)
     extract_from_project_info(path, payload)
-    extract_files(path, payload)
 
-    # Ask the credentials
-    username = input("Username: ")
+    # Compare the files with the last pulled or pushed version
+    changes = get_local_changes(path)
+    if not any(changes.values()):
+        logger.info("Nothing to push, the project is up to date.")
+        return
+
+    display_changes(changes)
+    if dry_run:
+        return
 
-    # Password is hidden
-    password = getpass.getpass("Password: ")
+    extract_files(path, payload)
 
-    # Send the request with the credentials
-    response = requests.put(
-        payload["url"],
-        json=payload,
-        auth=(username, password),
-        timeout=10
-    )
+    # Get the token, or ask the credentials
+    auth = upsilon_workshop_client.utils.login.get_auth(client)
+
+    # Send only the changed files if the server supports it
+    if upsilon_workshop_client.api.project.supports_partial_update(
+            payload["url"], client, auth):
+        logger.debug("Sending a partial update.")
+        response = client.patch(
+            payload["url"],
+            json=make_partial_payload(payload, changes),
+            auth=auth,
+            timeout=10
+        )
+    else:
+        # Send the request with the credentials
+        response = client.put(
+            payload["url"],
+            json=payload,
+            auth=auth,
+            timeout=10
+        )
 
     # Check the response
     if response.status_code == 200:
         logger.info("Project pushed successfully.")
     else:
         logger.error("Error while pushing the project: %s", response.text)
+        if response.status_code == 401:
+            logger.error("Log in again with 'workshop login'.")
         sys.exit(1)
 
     # Update the project_info.json
+    with upsilon_workshop_client.timings.phase("json"):
+        project = response.json()
     upsilon_workshop_client.utils.clone.save_project_info(
-        upsilon_workshop_client.api.project.Project(response.json()),
+        upsilon_workshop_client.api.project.Project(project),
         path
     )
 
 
+def get_local_changes(path: str) -> dict[str, list[str]]:
+    """Get the files changed since the last pull or push."""
+    # Get the real path
+    realpath = os.path.realpath(path)
+
+    # Get the checksums saved in the project info
+    try:
+        with open(f"{realpath}/.project_info.json", "r", encoding="utf-8")\
+                as f:
+            project_info = json.load(f)
+    except (FileNotFoundError, NotADirectoryError, ValueError):
+        project_info = {}
+    project_info_checksums: dict[str, str] = project_info.get("checksums", {})
+
+    # Get the checksums of the local files
+    local_checksums = upsilon_workshop_client.utils.clone.generate_checksums(
+        realpath)
+
+    changes: dict[str, list[str]] = {
+        "modified": [
+            file
+            for file, checksum in local_checksums.items()
+            if file in project_info_checksums
+            and checksum != project_info_checksums[file]
+        ],
+        "added": [
+            file
+            for file in local_checksums
+            if file not in project_info_checksums
+        ],
+        "deleted": [
+            file
+            for file in project_info_checksums
+            if file not in local_checksums
+        ],
+    }
+
+    # The README.md holds the name and the description of the project
+    readme_checksum = upsilon_workshop_client.utils.clone.\
+        generate_readme_checksum(realpath)
+    if "readme_checksum" not in project_info or\
+            readme_checksum != project_info["readme_checksum"]:
+        changes["modified"].append("README.md")
+
+    return changes
+
+
+def display_changes(changes: dict[str, list[str]]) -> None:
+    """Display the files that will be pushed."""
+    for change, files in changes.items():
+        for file in sorted(files):
+            logger.info("%s: %s", change.capitalize(), file)
+
+
+def make_partial_payload(payload: dict[str, str | list[dict[str, str]]],
+                         changes: dict[str, list[str]])\
+        -> dict[str, str | list[dict[str, str]] | list[str]]:
+    """Keep only the changed files in the payload."""
+    changed_files = set(changes["modified"]) | set(changes["added"])
+
+    partial_payload: dict[str, str | list[dict[str, str]] | list[str]] = {
+        key: value for key, value in payload.items() if key != "files"
+    }
+    partial_payload["files"] = [
+        file for file in payload["files"] if file["name"] in changed_files
+    ]
+    partial_payload[upsilon_workshop_client.api.project.
+                    PARTIAL_UPDATE_FIELD] = changes["deleted"]
+
+    return partial_payload
+
+
 def extract_project_name_and_description(path: str, payload:
                                          dict[
                                              str,
@@ -135,27 +233,26 @@ def extract_files(path: str, payload: dict[str, str | list[dict[str, str]]])\
         payload["files"][0]["name"] = os.path.basename(path)
         return
 
-    # Iterate over the files
-    for root, _, files in os.walk(realpath):
-        for file in files:
-            # Ignore the project info file and the README.md
-            if file in [".project_info.json", "README.md"]:
-                continue
-
-            # Add the file to the list
-            add_file_to_list(root, file, path, payload)
+    # Iterate over the files (without the project info file, the checksum
+    # cache and the README.md)
+    for file in sorted(
+            upsilon_workshop_client.utils.scan.scan_files(realpath)):
+        # Add the file to the list
+        add_file_to_list(realpath, file, realpath, payload)
 
 
 def add_file_to_list(root: str, file: str, path: str,
                      payload: dict[str, str | list[dict[str, str]]]) -> None:
+    """Add a file to the payload, named relatively to the project."""
     # Get the real path
     realpath = os.path.realpath(f"{root}/{file}")
 
-    # Get the relative path
-    relativepath = os.path.relpath(realpath, path)
+    # Get the relative path, with the same separator on every system
+    relativepath = os.path.relpath(realpath, path).replace(os.sep, "/")
 
     # Get the file content
-    with open(realpath, "r", encoding="utf-8") as f:
+    with upsilon_workshop_client.timings.phase("disk"),\
+            open(realpath, "r", encoding="utf-8") as f:
         content = f.read()
 
     # Add the file to the list
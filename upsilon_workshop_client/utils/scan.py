@@ -0,0 +1,144 @@
+"""Client for the Upsilon Workshop - Project files scanner."""
+# Standard Library
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import time
+
+# Internal
+import upsilon_workshop_client.timings
+
+logger = logging.getLogger(__name__)
+
+# Cache of the checksums, keyed by the stat signature of the files
+CHECKSUM_CACHE_FILE = ".checksum_cache.json"
+
+# Files of the project directory that are not project files
+IGNORED_FILES = ("README.md", ".project_info.json", CHECKSUM_CACHE_FILE)
+
+# Files modified less than this many seconds before being hashed are not
+# cached, as a later write in the same mtime tick wouldn't change the stat
+RACY_DELAY = 2
+
+# Size of the chunks read when hashing a file
+CHUNK_SIZE = 1024 * 1024
+
+
+def scan_files(path: str) -> dict[str, os.stat_result]:
+    """List the project files, recursively.
+
+    The files are keyed by their path relative to the project, with `/` as
+    separator, like the file names sent to the server.
+    """
+    files: dict[str, os.stat_result] = {}
+
+    def scan_directory(directory: str, prefix: str) -> None:
+        """Scan a directory and its subdirectories."""
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                # Skip the README.md, .project_info.json and checksum cache
+                if not prefix and entry.name in IGNORED_FILES:
+                    continue
+
+                if entry.is_dir(follow_symlinks=False):
+                    scan_directory(entry.path, f"{prefix}{entry.name}/")
+                elif entry.is_file():
+                    files[f"{prefix}{entry.name}"] = entry.stat()
+
+    scan_directory(path, "")
+
+    return files
+
+
+def hash_file(path: str) -> str:
+    """Hash a file by chunks, without reading it whole in memory."""
+    checksum = hashlib.sha256()
+    with upsilon_workshop_client.timings.phase("hashing"),\
+            open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            checksum.update(chunk)
+
+    return checksum.hexdigest()
+
+
+def generate_checksums(path: str, jobs: int | None = None) -> dict[str, str]:
+    """Generate the checksums of the project files.
+
+    Only the files whose stat signature changed since the last call are
+    hashed, on a thread pool (hashlib releases the GIL on large buffers).
+    """
+    # Get the real path
+    realpath = os.path.realpath(path)
+
+    # If the path is a file, don't generate the checksums
+    if os.path.isfile(realpath):
+        return {}
+
+    files = scan_files(realpath)
+
+    # Reuse the checksums of the files that didn't change
+    cache = load_checksum_cache(realpath)
+    checksums: dict[str, str] = {}
+    signatures: dict[str, list[int]] = {}
+    to_hash: list[str] = []
+    for file, stat in files.items():
+        signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        signatures[file] = signature
+
+        cached = cache.get(file)
+        if cached is not None and cached["signature"] == signature:
+            checksums[file] = cached["checksum"]
+        else:
+            to_hash.append(file)
+
+    # Hash the other files
+    if len(to_hash) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs)\
+                as executor:
+            for file, checksum in zip(to_hash, executor.map(
+                    hash_file, [f"{realpath}/{file}" for file in to_hash])):
+                checksums[file] = checksum
+    elif to_hash:
+        checksums[to_hash[0]] = hash_file(f"{realpath}/{to_hash[0]}")
+
+    logger.debug("Hashed %s of %s files in %s.", len(to_hash), len(files),
+                 realpath)
+
+    # Cache the checksums, except the ones of the files changed too recently
+    now = time.time_ns()
+    new_cache = {
+        file: {"signature": signatures[file], "checksum": checksums[file]}
+        for file, stat in files.items()
+        if now - stat.st_mtime_ns > RACY_DELAY * 1_000_000_000
+    }
+    if new_cache != cache:
+        save_checksum_cache(realpath, new_cache)
+
+    # Keep the order of the files stable
+    return {file: checksums[file] for file in sorted(checksums)}
+
+
+def load_checksum_cache(path: str) -> dict[str, dict[str, list[int] | str]]:
+    """Load the checksum cache of a project."""
+    try:
+        with upsilon_workshop_client.timings.phase("disk"),\
+                open(f"{path}/{CHECKSUM_CACHE_FILE}", "r",
+                     encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_checksum_cache(path: str,
+                        cache: dict[str, dict[str, list[int] | str]]) -> None:
+    """Save the checksum cache of a project."""
+    try:
+        with upsilon_workshop_client.timings.phase("disk"),\
+                open(f"{path}/{CHECKSUM_CACHE_FILE}", "w",
+                     encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError as error:
+        # The cache is only an optimization
+        logger.debug("Failed to save the checksum cache: %s", error)
@@ -1,28 +1,59 @@
 """Client for the Upsilon Workshop - Project searching handler."""
 # Standard Library
 import logging
+import sqlite3
+from typing import Iterable, Optional
+
 import rich
 
 # Internal
+import upsilon_workshop_client.api.client
 import upsilon_workshop_client.api.search
+import upsilon_workshop_client.utils.catalog
 
 logger = logging.getLogger(__name__)
 
 
-def search(keywords: list[str], url: str) -> None:
+def search(keywords: list[str],
+           client: upsilon_workshop_client.api.client.Client,
+           max_results: Optional[int] = None, offline: bool = False) -> None:
     """Search a project."""
     logger.info("Searching %s.", keywords)
 
-    # Search the project
-    results = upsilon_workshop_client.api.search.search_project(
-        keywords, url)
+    if offline:
+        # Search the project in the local catalog
+        display_results(upsilon_workshop_client.utils.catalog.search(
+            keywords, max_results=max_results))
+        return
+
+    # Search the project, the pages are fetched while the table is filled
+    results = upsilon_workshop_client.api.search.iter_search_project(
+        keywords, client, max_results)
+
+    # Nothing is written to the cache directory with --no-cache
+    if client.cache is None:
+        display_results(results)
+        return
 
-    # Display the results
-    display_results(results)
+    # Add the results to the local catalog as they arrive, the search works
+    # even if the catalog can't be written
+    try:
+        connection = upsilon_workshop_client.utils.catalog.open_catalog()
+    except (sqlite3.Error, OSError) as error:
+        logger.warning("Failed to open the catalog: %s", error)
+        display_results(results)
+        return
+
+    try:
+        # Display the results
+        display_results(upsilon_workshop_client.utils.catalog.add_projects(
+            connection, results, ignore_errors=True))
+    finally:
+        connection.close()
 
 
 def display_results(results:
-        list[upsilon_workshop_client.api.project.Project]) -> None:
+        Iterable[upsilon_workshop_client.api.project.Project]) -> None:
     """Display the results."""
     logger.debug("Displaying results...")
 
@@ -31,7 +62,6 @@ def display_results(results:
                              "Description", "URL", title="Results",
                              box=rich.box.HORIZONTALS)
 
-
     for result in results:
         table.add_row(
             result.name,
@@ -43,7 +73,7 @@ def display_results(results:
         )
 
     # If there are no results, display a message
-    if not results:
+    if not table.row_count:
         rich.print("No results found.")
     else:
         rich.print(table)
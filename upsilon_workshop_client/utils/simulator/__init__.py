@@ -1,2 +1,10 @@
 """Client for the Upsilon Workshop - Various utilities to manage simulator."""
-from upsilon_workshop_client.utils.simulator import run
+# Internal
+from upsilon_workshop_client import lazy
+
+# The submodules are imported when first used, to start the CLI faster
+__getattr__, __dir__ = lazy.attach(__name__, [
+    "download",
+    "run",
+    "test",
+])
@@ -0,0 +1,287 @@
+"""Client for the Upsilon Workshop - Simulator download and cache."""
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import urllib.parse
+from typing import Optional
+
+import rich.progress
+
+import upsilon_workshop_client.api.cache
+import upsilon_workshop_client.api.client
+
+logger = logging.getLogger(__name__)
+
+# Firebase bucket and object (without extension) of each simulator
+SIMULATORS = {
+    "upsilon": ("upsilon-binfiles.appspot.com", "dev/simulator/epsilon"),
+}
+
+# URL of the Firebase storage objects
+FIREBASE_URL = "https://firebasestorage.googleapis.com/v0/b/{bucket}/o/{name}"
+
+# Seconds after which the cached simulators are checked for a newer build
+METADATA_TTL = 24 * 60 * 60
+
+# Size of the chunks of the download
+CHUNK_SIZE = 64 * 1024
+
+# Extension of the simulator executables on this system
+EXTENSION = "exe" if os.name == "nt" else "bin"
+
+
+def get_simulator_directory() -> str:
+    """Get the directory where the simulators are cached."""
+    return os.path.join(
+        upsilon_workshop_client.api.cache.get_cache_directory(),
+        "simulators"
+    )
+
+
+def get_simulator(firmware: str,
+                  client: upsilon_workshop_client.api.client.Client,
+                  refresh: bool = False) -> str:
+    """Get the path of the simulator, downloading it if needed.
+
+    The simulators are cached per user and keyed by the generation of the
+    Firebase object. The metadata is only checked again once it's older than
+    METADATA_TTL (or if a refresh is asked), and the cached simulator is used
+    as is when the metadata can't be fetched (offline).
+    """
+    if firmware not in SIMULATORS:
+        logger.error("Unknown simulator %s", firmware)
+        raise NotImplementedError(
+            f"Unknown simulator {firmware} (available: "
+            f"{', '.join(sorted(SIMULATORS))})"
+        )
+
+    directory = get_simulator_directory()
+    state = load_state(firmware)
+    cached_path = os.path.join(directory, state["file"]) if state else None
+    has_cached = cached_path is not None and os.path.exists(cached_path)
+
+    # Use the cached simulator while its metadata is fresh
+    if has_cached and not refresh and\
+            time.time() - state["checked"] < METADATA_TTL:
+        logger.debug("Using cached %s simulator %s", firmware, cached_path)
+        return cached_path
+
+    # Check the latest build
+    bucket_name, object_name = SIMULATORS[firmware]
+    file_name = f"{object_name}.{EXTENSION}"
+    try:
+        metadata = get_metadata(bucket_name, file_name, client)
+    except (OSError, ValueError) as error:
+        if has_cached:
+            logger.warning("Failed to check the %s simulator version (%s), "
+                           "using the cached one.", firmware, error)
+            return cached_path
+        raise
+
+    path = os.path.join(directory,
+                        f"{firmware}-{metadata['generation']}.{EXTENSION}")
+
+    if has_cached and cached_path == path:
+        logger.debug("Cached %s simulator is up to date", firmware)
+    else:
+        logger.info("Downloading %s simulator (generation %s)", firmware,
+                    metadata["generation"])
+        os.makedirs(directory, exist_ok=True)
+        download_simulator(bucket_name, file_name, metadata, path, client)
+
+        # Remove the previous build
+        if has_cached:
+            os.remove(cached_path)
+
+    save_state(firmware, {
+        "file": os.path.basename(path),
+        "generation": metadata["generation"],
+        "md5Hash": metadata.get("md5Hash"),
+        "checked": time.time(),
+    })
+
+    return path
+
+
+def prefetch(firmwares: list[str],
+             client: upsilon_workshop_client.api.client.Client) -> None:
+    """Download the latest simulators, to use them offline."""
+    for firmware in firmwares:
+        path = get_simulator(firmware, client, refresh=True)
+        logger.info("Simulator %s available at %s", firmware, path)
+
+
+def load_state(firmware: str) -> Optional[dict[str, str | float]]:
+    """Load the state of the cached simulator."""
+    try:
+        with open(os.path.join(get_simulator_directory(), f"{firmware}.json"),
+                  "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_state(firmware: str, state: dict[str, str | float]) -> None:
+    """Save the state of the cached simulator."""
+    with open(os.path.join(get_simulator_directory(), f"{firmware}.json"),
+              "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4)
+
+
+def download_simulator(bucket_name: str, file_name: str,
+                       metadata: dict[str, str], path: str,
+                       client: upsilon_workshop_client.api.client.Client):
+    """Download the simulator.
+
+    The file is streamed to a .part file, resumed with a Range request if a
+    previous download was interrupted, verified against the md5 hash of the
+    metadata and then renamed in place.
+    """
+    logger.debug("Downloading %s to %s", file_name, path)
+
+    # Generate the URL of the file.
+    url = FIREBASE_URL.format(
+        bucket=bucket_name, name=urllib.parse.quote(file_name, safe="")
+    ) + f"?alt=media&token={metadata['downloadTokens']}"
+
+    partial_path = f"{path}.part"
+    total = int(metadata.get("size", 0)) or None
+
+    # Resume the previous download if any
+    try:
+        offset = os.path.getsize(partial_path)
+    except FileNotFoundError:
+        offset = 0
+
+    # Download the rest of the file, unless the previous download has been
+    # interrupted after the end of the transfer
+    start_time = time.monotonic()
+    if total is None or offset < total:
+        offset = fetch_file(url, partial_path, offset, total, client)
+
+    # Report the throughput
+    size = os.path.getsize(partial_path)
+    duration = max(time.monotonic() - start_time, 1e-6)
+    logger.info("Downloaded %.1f MiB in %.1f s (%.1f MiB/s)",
+                (size - offset) / 2**20, duration,
+                (size - offset) / 2**20 / duration)
+
+    # Keep an incomplete file, to resume the download next time
+    if total is not None and size < total:
+        raise ValueError(
+            f"Download of {file_name} interrupted at {size} of {total} "
+            "bytes, run the command again to resume it"
+        )
+
+    # Verify the file, the md5 hash of Firebase is encoded in base64
+    checksum = hashlib.md5()
+    with open(partial_path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            checksum.update(chunk)
+    expected = metadata.get("md5Hash")
+    actual = base64.b64encode(checksum.digest()).decode("ascii")
+    if (expected is not None and actual != expected) or\
+            (total is not None and size != total):
+        # Start from scratch next time
+        os.remove(partial_path)
+        raise ValueError(
+            f"Downloaded {file_name} is corrupted (md5 {actual}, expected "
+            f"{expected}, {size} of {total} bytes)"
+        )
+
+    # Make the file executable, then move it in place.
+    os.chmod(partial_path, 0o755)
+    os.replace(partial_path, path)
+
+
+def fetch_file(url: str, partial_path: str, offset: int,
+               total: Optional[int],
+               client: upsilon_workshop_client.api.client.Client) -> int:
+    """Download a file to the .part file, from an offset.
+
+    Return the offset the download has been resumed at (0 if the server
+    sent the whole file).
+    """
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+    with client.get(url, headers=headers, stream=True, timeout=30)\
+            as response:
+        if response.status_code == 416:
+            # Nothing left to download, the file is checked by the caller
+            logger.debug("Download already complete at %s bytes", offset)
+            return offset
+
+        if response.status_code == 206:
+            # Only append the part starting where the file ends
+            start = get_range_start(response.headers.get("Content-Range"))
+            if start != offset:
+                logger.debug("Download resumed at %s instead of %s, "
+                             "restarting it", start, offset)
+                return fetch_file(url, partial_path, 0, total, client)
+
+            logger.debug("Resuming download at %s bytes", offset)
+            mode = "ab"
+        elif response.status_code == 200:
+            offset = 0
+            mode = "wb"
+        else:
+            raise ValueError(
+                f"Failed to download {url} (status code "
+                f"{response.status_code})"
+            )
+
+        # Save the file, reporting the progress and the throughput.
+        with open(partial_path, mode) as file, rich.progress.Progress(
+            rich.progress.TextColumn(
+                os.path.basename(partial_path).removesuffix(".part")),
+            rich.progress.BarColumn(),
+            rich.progress.DownloadColumn(),
+            rich.progress.TransferSpeedColumn(),
+            rich.progress.TimeRemainingColumn(),
+            transient=True,
+        ) as progress:
+            task = progress.add_task("download", total=total,
+                                     completed=offset)
+            for chunk in response.iter_content(CHUNK_SIZE):
+                file.write(chunk)
+                progress.update(task, advance=len(chunk))
+
+    return offset
+
+
+def get_range_start(content_range: Optional[str]) -> Optional[int]:
+    """Get the first byte of a Content-Range header (bytes START-END/SIZE)."""
+    match = re.match(r"bytes (\d+)-", content_range or "")
+    return int(match[1]) if match else None
+
+
+def get_metadata(bucket_name: str, file_name: str,
+                 client: upsilon_workshop_client.api.client.Client)\
+        -> dict[str, str]:
+    """Get the metadata of a file of a Firebase bucket."""
+    # Generate the URL of the file.
+    url = FIREBASE_URL.format(
+        bucket=bucket_name, name=urllib.parse.quote(file_name, safe="")
+    )
+
+    # Download the metadata.
+    response = client.get(url, timeout=30)
+
+    if response.status_code != 200:
+        raise ValueError(
+            f"Failed to get {file_name} metadata: {response.text} "
+            f"(status code {response.status_code})"
+        )
+
+    # Parse the response as JSON.
+    return response.json()
+
+
+def get_token(bucket_name: str, file_name: str,
+              client: upsilon_workshop_client.api.client.Client) -> str:
+    """Get a download token from a Firebase bucket."""
+    return get_metadata(bucket_name, file_name, client)['downloadTokens']
@@ -4,12 +4,19 @@ import os
 import subprocess
 from typing import Optional
 
-import requests
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.utils.scan
+import upsilon_workshop_client.utils.simulator.download
 
 logger = logging.getLogger(__name__)
 
+# Maximum size of a single command argument on Linux (MAX_ARG_STRLEN)
+MAX_ARGUMENT_SIZE = 128 * 1024
 
-def run(project: Optional[str], firmware: str):
+
+def run(project: Optional[str], firmware: str,
+        client: upsilon_workshop_client.api.client.Client,
+        refresh: bool = False):
     """Run a project."""
     if project is None:
         logger.log(logging.DEBUG, "Running %s simulator", firmware)
@@ -17,17 +24,9 @@ def run(project: Optional[str], firmware: str):
         logger.log(logging.DEBUG, "Running %s simulator for project %s",
                    firmware, project)
 
-    path = f"{firmware}.{'exe' if os.name == 'nt' else 'bin'}"
-
-    # Download the simulator if path does not exist
-    if not os.path.exists(path):
-        logger.debug("Simulator not found, downloading it")
-        download_simulator(firmware, path)
-    else:
-        logger.debug("Simulator found, skipping download")
-
-    # Set the path to the simulator real path
-    path = os.path.realpath(path)
+    # Get the simulator from the cache, downloading it if needed
+    path = upsilon_workshop_client.utils.simulator.download.get_simulator(
+        firmware, client, refresh)
 
     # Generate the command arguments to run the simulator
     command_args = generate_command_args(project)
@@ -37,89 +36,74 @@ def run(project: Optional[str], firmware: str):
 
 
 def generate_command_args(project: Optional[str]) -> list[str]:
-    """Generate the command arguments to run the simulator."""
+    """Generate the command arguments to run the simulator.
+
+    The project can be a script or a project directory (as cloned by
+    `workshop clone`), every script of the directory is then loaded.
+    """
     logger.debug("Generating command arguments")
 
-    # Generate the command arguments to run the simulator
+    # Run the simulator without a project
     if project is None:
-        # Run the simulator without a project
-        command_args = []
-    elif os.path.isdir(project):
-        logger.error("Running a directory is not supported yet")
-        raise NotImplementedError
-    else:
-        # Ensure the project is a file
-        if not os.path.isfile(project):
-            logger.error("Project %s is not a file", project)
-            raise FileNotFoundError(
-                "Importing a directory is not supported yet")
-
-        # Read the content of the file
-        with open(project, 'r', encoding='utf-8') as file:
-            content = file.read()
-
-        # Get the file name (without the directory)
-        project = os.path.basename(project)
-
-        # Generate the command arguments
-        command_args = [
-            "--code-script",
-            f"{project}:{content}",
-            "--code-lock-on-console",
-            "--volatile"
-        ]
-
-    return command_args
-
-
-def download_simulator(firmware: str, path: str):
-    """Download the simulator."""
-    logger.debug("Downloading %s simulator", firmware)
-
-    # Download the simulator that matches the firmware
-    if firmware == "upsilon":
-        # Download the Upsilon simulator
-        download_simulator_upsilon(path)
+        return []
+
+    # Get the scripts to load, keyed by their name on the calculator
+    if os.path.isdir(project):
+        scripts = get_project_scripts(project)
+    elif os.path.isfile(project):
+        scripts = {os.path.basename(project): project}
     else:
-        logger.error("Unknown simulator %s", firmware)
-        raise NotImplementedError(f"Unknown simulator {firmware}")
+        logger.error("Project %s not found", project)
+        raise FileNotFoundError(f"Project {project} not found")
+
+    if not scripts:
+        logger.error("Project %s has no script", project)
+        raise ValueError(f"Project {project} has no script")
 
+    # Generate the command arguments, one argument by script
+    command_args = []
+    for name, path in scripts.items():
+        command_args += ["--code-script", read_script(name, path)]
 
-def download_simulator_upsilon(path: str):
-    """Download the Upsilon simulator."""
-    bucket_name = 'upsilon-binfiles.appspot.com'
+    return command_args + ["--code-lock-on-console", "--volatile"]
 
-    # Generate the file name
-    file_name = f"dev%2Fsimulator%2Fepsilon.{path.split('.')[-1]}"
 
-    # Get the download token.
-    token = get_token(bucket_name, file_name)
+def get_project_scripts(path: str) -> dict[str, str]:
+    """Get the scripts of a project directory, keyed by their name.
 
-    # Generate the URL of the file.
-    url = f"https://firebasestorage.googleapis.com/v0/b/{bucket_name}/o/" + \
-          f"{file_name}?alt=media&token={token}"
+    The storage of the calculator is flat, so the scripts of the
+    subdirectories are loaded by their file name.
+    """
+    scripts: dict[str, str] = {}
+    for file in sorted(upsilon_workshop_client.utils.scan.scan_files(path)):
+        name = file.split("/")[-1]
 
-    # Download the file.
-    response = requests.get(url, timeout=30)
+        # The simulator only runs Python scripts
+        if not name.endswith(".py"):
+            logger.debug("Skipping %s, not a script", file)
+            continue
 
-    # Save the file.
-    with open(path, 'w+b') as file:
-        file.write(response.content)
+        if name in scripts:
+            logger.error("Several scripts are named %s", name)
+            raise ValueError(f"Several scripts of {path} are named {name}")
 
-    # Make the file executable.
-    os.chmod(path, 0o755)
+        scripts[name] = os.path.join(path, file)
 
+    return scripts
 
-def get_token(bucket_name: str, file_name: str) -> str:
-    """Get a download token from a Firebase bucket."""
-    # Generate the URL of the file.
-    url = "https://firebasestorage.googleapis.com/v0/b/" + \
-        f"{bucket_name}/o/{file_name}"
 
-    # Download the file.
-    response = requests.get(url, timeout=30)
+def read_script(name: str, path: str) -> str:
+    """Read a script as a --code-script argument (name:content)."""
+    with open(path, "r", encoding="utf-8") as file:
+        argument = f"{name}:{file.read()}"
 
-    # Parse the response as JSON.
-    json = response.json()
+    # Fail clearly instead of with E2BIG when the script is too long for an
+    # argument (such a script wouldn't fit in the calculator storage anyway)
+    if os.name != "nt" and len(argument.encode("utf-8")) >= MAX_ARGUMENT_SIZE:
+        logger.error("Script %s is too large for the simulator", name)
+        raise ValueError(
+            f"Script {name} is too large for the simulator (over "
+            f"{MAX_ARGUMENT_SIZE // 1024} KiB)"
+        )
 
-    return json['downloadTokens']
+    return argument
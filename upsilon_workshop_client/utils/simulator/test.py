@@ -0,0 +1,196 @@
+"""Client for the Upsilon Workshop - Simulator batch test runner."""
+import concurrent.futures
+import json
+import logging
+import os
+import subprocess
+import time
+import xml.etree.ElementTree
+from typing import Optional
+
+import rich
+import rich.box
+import rich.table
+
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.utils.simulator.download
+import upsilon_workshop_client.utils.simulator.run
+
+logger = logging.getLogger(__name__)
+
+# Arguments running the simulator without a window
+HEADLESS_ARGS = ["--headless"]
+
+# Status of the runs, and the color used to display them
+STATUS_COLORS = {
+    "passed": "green",
+    "failed": "red",
+    "timeout": "yellow",
+    "error": "red",
+}
+
+
+def test(projects: list[str], firmwares: list[str],
+         client: upsilon_workshop_client.api.client.Client,
+         jobs: int = 4, timeout: float = 30,
+         report: Optional[str] = None, refresh: bool = False) -> bool:
+    """Run every project on every firmware in headless simulators.
+
+    The simulators run in parallel, at most `jobs` at a time, and are killed
+    after `timeout` seconds. A JUnit (.xml) or JSON (.json) report is written
+    if asked. Return True if every run passed.
+    """
+    # Get the simulators first, so they're downloaded only once
+    simulators = {
+        firmware: upsilon_workshop_client.utils.simulator.download.
+        get_simulator(firmware, client, refresh)
+        for firmware in firmwares
+    }
+
+    logger.info("Running %s projects on %s firmwares...", len(projects),
+                len(firmwares))
+
+    # The simulators are separate processes, the threads only wait for them
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(run_test, project, firmware, simulator, timeout)
+            for firmware, simulator in simulators.items()
+            for project in projects
+        ]
+        results = [future.result() for future in futures]
+
+    display_results(results)
+
+    if report is not None:
+        if report.endswith(".json"):
+            write_json_report(results, report)
+        else:
+            write_junit_report(results, report)
+        logger.info("Report written to %s", report)
+
+    return all(result["status"] == "passed" for result in results)
+
+
+def run_test(project: str, firmware: str, simulator: str,
+             timeout: float) -> dict[str, str | int | float | None]:
+    """Run a project in a headless simulator, and capture its output."""
+    result: dict[str, str | int | float | None] = {
+        "project": project,
+        "firmware": firmware,
+        "status": "error",
+        "returncode": None,
+        "duration": 0.0,
+        "stdout": "",
+        "stderr": "",
+    }
+
+    start_time = time.monotonic()
+    try:
+        command_args = upsilon_workshop_client.utils.simulator.run.\
+            generate_command_args(project)
+        process = subprocess.run(
+            [simulator, *command_args, *HEADLESS_ARGS],
+            capture_output=True,
+            timeout=timeout,
+            check=False,
+        )
+    except subprocess.TimeoutExpired as error:
+        result["status"] = "timeout"
+        result["stdout"] = decode_output(error.stdout)
+        result["stderr"] = decode_output(error.stderr)
+    except (OSError, ValueError) as error:
+        # The project can't be read, or the simulator can't be started
+        result["stderr"] = f"{error.__class__.__name__}: {error}"
+    else:
+        result["status"] = "passed" if process.returncode == 0 else "failed"
+        result["returncode"] = process.returncode
+        result["stdout"] = decode_output(process.stdout)
+        result["stderr"] = decode_output(process.stderr)
+    result["duration"] = time.monotonic() - start_time
+
+    logger.debug("%s on %s: %s in %.2f s", project, firmware,
+                 result["status"], result["duration"])
+
+    return result
+
+
+def decode_output(output: Optional[bytes]) -> str:
+    """Decode the captured output of a simulator."""
+    return output.decode("utf-8", errors="replace") if output else ""
+
+
+def display_results(results: list[dict[str, str | int | float | None]])\
+        -> None:
+    """Display the status and the duration of every run."""
+    table = rich.table.Table("Project", "Firmware", "Status", "Duration",
+                             title="Simulator tests",
+                             box=rich.box.HORIZONTALS)
+
+    for result in results:
+        color = STATUS_COLORS[result["status"]]
+        table.add_row(result["project"], result["firmware"],
+                      f"[{color}]{result['status']}[/{color}]",
+                      f"{result['duration']:.2f} s")
+
+    rich.print(table)
+
+    passed = sum(result["status"] == "passed" for result in results)
+    rich.print(f"{passed}/{len(results)} runs passed.")
+
+
+def write_json_report(results: list[dict[str, str | int | float | None]],
+                      path: str) -> None:
+    """Write the results as a JSON report."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+
+
+def write_junit_report(results: list[dict[str, str | int | float | None]],
+                       path: str) -> None:
+    """Write the results as a JUnit XML report, one test suite by firmware."""
+    root = xml.etree.ElementTree.Element("testsuites")
+
+    suites: dict[str, xml.etree.ElementTree.Element] = {}
+    for result in results:
+        firmware = str(result["firmware"])
+        if firmware not in suites:
+            suites[firmware] = xml.etree.ElementTree.SubElement(
+                root, "testsuite", name=firmware)
+        suite = suites[firmware]
+
+        case = xml.etree.ElementTree.SubElement(
+            suite, "testcase", classname=firmware,
+            name=os.path.normpath(str(result["project"])),
+            time=f"{result['duration']:.3f}")
+
+        # Add the failure, if any
+        if result["status"] == "failed":
+            xml.etree.ElementTree.SubElement(
+                case, "failure",
+                message=f"Exited with status {result['returncode']}")
+        elif result["status"] == "timeout":
+            xml.etree.ElementTree.SubElement(case, "failure",
+                                             message="Timed out")
+        elif result["status"] == "error":
+            xml.etree.ElementTree.SubElement(case, "error",
+                                             message=str(result["stderr"]))
+
+        xml.etree.ElementTree.SubElement(case, "system-out").text =\
+            str(result["stdout"])
+        xml.etree.ElementTree.SubElement(case, "system-err").text =\
+            str(result["stderr"])
+
+    # Add the counts of every suite
+    for suite in suites.values():
+        cases = suite.findall("testcase")
+        suite.set("tests", str(len(cases)))
+        suite.set("failures", str(sum(len(case.findall("failure"))
+                                      for case in cases)))
+        suite.set("errors", str(sum(len(case.findall("error"))
+                                    for case in cases)))
+        duration = sum(float(case.get("time")) for case in cases)
+        suite.set("time", f"{duration:.3f}")
+
+    xml.etree.ElementTree.indent(root)
+    xml.etree.ElementTree.ElementTree(root).write(path, encoding="utf-8",
+                                                  xml_declaration=True)
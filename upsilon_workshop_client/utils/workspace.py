@@ -0,0 +1,128 @@
+"""Client for the Upsilon Workshop - Workspace handler."""
+# Standard Library
+import concurrent.futures
+import logging
+import os
+
+import rich
+import rich.box
+import rich.table
+
+# Internal
+import upsilon_workshop_client.api.client
+import upsilon_workshop_client.api.project
+import upsilon_workshop_client.utils.pull
+import upsilon_workshop_client.utils.push
+
+logger = logging.getLogger(__name__)
+
+# Status of the projects, and the color used to display them
+STATUS_COLORS = {
+    "up to date": "green",
+    "pulled": "green",
+    "outdated": "yellow",
+    "locally ahead": "cyan",
+    "conflicting": "red",
+    "failed": "red",
+}
+
+
+def find_projects(path: str) -> list[str]:
+    """Find the projects (directories with a .project_info.json) in a path."""
+    projects = []
+    for root, directories, files in os.walk(path):
+        if ".project_info.json" in files:
+            projects.append(root)
+
+            # The subdirectories are files of the project
+            directories.clear()
+            continue
+
+        # Skip the hidden directories (.git, temporary mirror copies...)
+        directories[:] = sorted(directory for directory in directories
+                                if not directory.startswith("."))
+
+    return sorted(projects)
+
+
+def sync_project(path: str,
+                 client: upsilon_workshop_client.api.client.Client,
+                 pull: bool = False) -> tuple[str, str]:
+    """Get the status of a project, and pull it if outdated.
+
+    Return the status and the files concerned.
+    """
+    project_info = upsilon_workshop_client.utils.pull.load_project_info(path)
+
+    server_project = upsilon_workshop_client.api.project.get_project(
+        project_info["url"], client)
+
+    if server_project.modified > project_info["modified"]:
+        plan = upsilon_workshop_client.utils.pull.get_pull_plan(
+            server_project, project_info, path)
+        if plan["conflicts"]:
+            return "conflicting", ", ".join(plan["conflicts"])
+
+        if pull:
+            upsilon_workshop_client.utils.pull.pull_project_from_server(
+                server_project, project_info, path)
+            return "pulled", ", ".join(plan["write"] + plan["delete"])
+
+        return "outdated", ", ".join(plan["write"] + plan["delete"])
+
+    # Files changed locally since the last pull or push
+    local_changes = upsilon_workshop_client.utils.push.get_local_changes(path)
+    if changed_files := sorted(file for files in local_changes.values()
+                               for file in files):
+        return "locally ahead", ", ".join(changed_files)
+
+    if server_project.modified < project_info["modified"]:
+        return "locally ahead", "local version is newer than the server"
+
+    return "up to date", ""
+
+
+def sync(path: str, client: upsilon_workshop_client.api.client.Client,
+         pull: bool = False, jobs: int = 8) -> bool:
+    """Check (and pull) every project of a workspace concurrently.
+
+    Conflicting projects are never pulled, nothing is asked to the user.
+    Return True if no project failed or conflicts.
+    """
+    projects = find_projects(path)
+    logger.info("Found %s projects in %s.", len(projects), path)
+
+    results: dict[str, tuple[str, str]] = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            project: executor.submit(sync_project, project, client, pull)
+            for project in projects
+        }
+        for project, future in futures.items():
+            try:
+                results[project] = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                logger.debug("Failed to check %s: %s", project, error)
+                results[project] = (
+                    "failed", f"{error.__class__.__name__}: {error}")
+
+    display_status(path, results)
+
+    return not any(status in ("failed", "conflicting")
+                   for status, _ in results.values())
+
+
+def display_status(path: str, results: dict[str, tuple[str, str]]) -> None:
+    """Display the status of every project."""
+    table = rich.table.Table("Project", "Status", "Files", title="Workspace",
+                             box=rich.box.HORIZONTALS)
+
+    for project, (status, details) in results.items():
+        color = STATUS_COLORS[status]
+        table.add_row(os.path.relpath(project, path),
+                      f"[{color}]{status}[/{color}]", details)
+
+    if not results:
+        rich.print("No project found.")
+    else:
+        rich.print(table)